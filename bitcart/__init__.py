@@ -1,9 +1,15 @@
 from universalasync import wrap
 
+from .backoff import Backoff
+from .cache import BaseCache, LRUCache
 from .coins import BCH, BNB, BTC, COINS, ETH, GRS, LTC, MATIC, TRX, XMR, XRG  # noqa: F401
+from .dedup import Deduplicator
+from .dispatch import EventDispatcher
 from .errors import errors
+from .executor import HandlerExecutor
 from .manager import APIManager
 from .providers.jsonrpcrequests import RPCProxy
+from .providers.pool import ConnectionPool
 from .version import VERSION
 
 # Make all types accessible via both sync and async contexts
@@ -11,5 +17,23 @@ for coin in COINS.values():
     wrap(coin)
 wrap(APIManager)
 wrap(RPCProxy)
+wrap(ConnectionPool)
+wrap(BaseCache)
+wrap(LRUCache)
+wrap(EventDispatcher)
+wrap(HandlerExecutor)
 
-__all__ = list(COINS.keys()) + ["APIManager", "COINS", "RPCProxy", "errors", "VERSION"]
+__all__ = list(COINS.keys()) + [
+    "APIManager",
+    "Backoff",
+    "BaseCache",
+    "COINS",
+    "ConnectionPool",
+    "Deduplicator",
+    "EventDispatcher",
+    "HandlerExecutor",
+    "LRUCache",
+    "RPCProxy",
+    "errors",
+    "VERSION",
+]
@@ -0,0 +1,40 @@
+import random
+
+
+class Backoff:
+    """Exponential backoff with optional full jitter
+
+    Delay before n-th retry is a random value between 0 and ``min(maximum, initial * multiplier ** (n - 1))``,
+    so that many clients reconnecting to the same daemon don't do it in lockstep.
+
+    Examples:
+        >>> backoff = Backoff(initial=1, maximum=30)
+        >>> backoff.delay(3)  # random value between 0 and 4
+        2.71
+
+    Args:
+        initial (Union[int, float], optional): base delay before first retry, in seconds. Defaults to 1.
+        maximum (Union[int, float], optional): maximum delay, in seconds. Defaults to 60.
+        multiplier (Union[int, float], optional): delay growth factor. Defaults to 2.
+        jitter (bool, optional): whether to randomize delays (full jitter). Defaults to True.
+    """
+
+    def __init__(self, initial: int | float = 1, maximum: int | float = 60, multiplier: int | float = 2, jitter: bool = True):
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Get delay before retry
+
+        Args:
+            attempt (int): retry number, starting from 1
+
+        Returns:
+            float: delay in seconds
+        """
+        delay = min(self.maximum, self.initial * self.multiplier ** max(attempt - 1, 0))
+        if self.jitter:
+            return random.uniform(0, delay)  # noqa: S311
+        return float(delay)
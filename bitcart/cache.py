@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from .utils import json_encode
+
+
+class BaseCache:
+    """Base class for cache backends
+
+    To implement an external backend (redis, memcached, ...), override :meth:`get`, :meth:`set` and :meth:`delete`.
+    Values are JSON-serializable objects returned by the daemon.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable) -> Any:
+        """Get value by key, returns None if key is missing"""
+        raise NotImplementedError()  # pragma: no cover
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        """Store value by key"""
+        raise NotImplementedError()  # pragma: no cover
+
+    async def delete(self, key: Hashable) -> None:
+        """Remove key from cache, if present"""
+        raise NotImplementedError()  # pragma: no cover
+
+    async def fetch(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool] = lambda value: True
+    ) -> Any:
+        """Get value from cache, or load it and store it if it is cacheable
+
+        Args:
+            key (Hashable): cache key
+            loader (Callable[[], Awaitable[Any]]): coroutine function loading the value on cache miss
+            cacheable (Callable[[Any], bool], optional): whether loaded value may be stored. Defaults to always.
+
+        Returns:
+            Any: cached or loaded value
+        """
+        value = await self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = await loader()
+        if value is not None and cacheable(value):
+            await self.set(key, value)
+        return value
+
+    def stats(self) -> dict[str, int]:
+        """Get cache hit/miss counters
+
+        Returns:
+            dict[str, int]: counters
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class LRUCache(BaseCache):
+    """In-memory cache evicting least recently used items
+
+    Args:
+        max_size (int, optional): maximum number of items. Defaults to 10000.
+        max_bytes (Optional[int], optional): maximum total size of items, estimated by their JSON size.
+            Defaults to None (no limit).
+    """
+
+    def __init__(self, max_size: int = 10000, max_bytes: int | None = None):
+        super().__init__()
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+
+    async def get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        size = len(json_encode(value)) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        await self.delete(key)
+        self._data[key] = (value, size)
+        self.size_bytes += size
+        while len(self._data) > self.max_size or (self.max_bytes is not None and self.size_bytes > self.max_bytes):
+            _, (_, evicted_size) = self._data.popitem(last=False)
+            self.size_bytes -= evicted_size
+
+    async def delete(self, key: Hashable) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.size_bytes -= item[1]
+
+    def stats(self) -> dict[str, int]:
+        return {**super().stats(), "size": len(self._data), "size_bytes": self.size_bytes}
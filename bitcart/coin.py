@@ -5,7 +5,7 @@ class Coin:
     coin_name: str
     xpub_name: str
     friendly_name: str
-    event_handlers: dict[str, Callable]
+    event_handlers: dict[str, list[Callable]]
     xpub: str | None
 
     def __eq__(self, other: object) -> bool:
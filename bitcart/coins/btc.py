@@ -1,15 +1,21 @@
-import inspect
-from collections.abc import Callable, Iterable
-from functools import wraps
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable
+from functools import partial, wraps
 from typing import TYPE_CHECKING, Any, Optional
 
+from ..cache import BaseCache
 from ..coin import Coin
+from ..dedup import Deduplicator
+from ..dispatch import EventDispatcher
 from ..errors import LightningDisabledError
 from ..event_delivery import EventDelivery
+from ..executor import HandlerExecutor
 from ..logger import logger
 from ..providers.jsonrpcrequests import RPCProxy
-from ..types import AmountType
-from ..utils import bitcoins, call_universal, convert_amount_type, satoshis
+from ..providers.pool import ConnectionPool
+from ..types import AmountType, Event
+from ..utils import bitcoins, convert_amount_type, satoshis
 
 if TYPE_CHECKING:
     from aiohttp import ClientSession, ClientWebSocketResponse
@@ -38,6 +44,8 @@ class BTC(Coin, EventDelivery):
     ALLOWED_EVENTS = ["new_block", "new_transaction", "new_payment", "verified_tx"]
     BALANCE_ATTRS = ["confirmed", "unconfirmed", "unmatured", "lightning"]
     EXPIRATION_KEY = "expiry"
+    TX_CACHE_CONFIRMATIONS = 1
+    SEEN_TXES_LIMIT = 10000
     is_eth_based = False
     additional_xpub_fields: list[str] = []
 
@@ -49,16 +57,34 @@ class BTC(Coin, EventDelivery):
         xpub: str | None = None,
         proxy: str | None = None,
         session: Optional["ClientSession"] = None,
+        pool: ConnectionPool | None = None,
+        tx_cache: BaseCache | None = None,
+        dispatcher: EventDispatcher | None = None,
+        deduplicator: Deduplicator | None = None,
+        handler_mode: str = "sequential",
+        handler_executor: HandlerExecutor | None = None,
+        **rpc_options: Any,
     ):
-        super().__init__()
+        super().__init__(
+            dispatcher=dispatcher,
+            deduplicator=deduplicator,
+            handler_mode=handler_mode,
+            handler_executor=handler_executor,
+        )
         self.symbol = self.coin_name
         self.rpc_url = rpc_url or self.RPC_URL
         self.rpc_user = rpc_user or self.RPC_USER
         self.rpc_pass = rpc_pass or self.RPC_PASS
         self.xpub = xpub
-        self.event_handlers: dict[str, Callable] = {}
+        self.event_handlers: dict[str, list[Callable]] = {}
         self.amount_field = getattr(self, "AMOUNT_FIELD", f"amount_{self.coin_name}")
-        self.server = RPCProxy(self.rpc_url, self.rpc_user, self.rpc_pass, self.xpub, session=session, proxy=proxy)
+        self.tx_cache = tx_cache
+        self._block_height: int | None = None
+        self._recovery_height: int | None = None
+        self._seen_txes: dict[str, None] = {}
+        self.server = RPCProxy(
+            self.rpc_url, self.rpc_user, self.rpc_pass, self.xpub, session=session, proxy=proxy, pool=pool, **rpc_options
+        )
 
     @property
     async def spec(self) -> dict:
@@ -92,6 +118,10 @@ class BTC(Coin, EventDelivery):
 
         Given tx hash of transaction, return full information as dictionary
 
+        If coin was created with ``tx_cache``, transactions with at least ``TX_CACHE_CONFIRMATIONS`` confirmations
+        are cached. Cached transactions store the height of their block instead of confirmations,
+        and ``confirmations`` is recomputed from current blockchain height on every read
+
         Examples:
             >>> c.get_tx("54604b116b28124e31d2d20bbd4561e6f8398dca4b892080bffc8c87c27762ba")
             {'partial': False, 'version': 2, 'segwit_ser': True, 'inputs': [{'prevout_hash': 'xxxx',...
@@ -102,9 +132,36 @@ class BTC(Coin, EventDelivery):
         Returns:
             dict: transaction info
         """
-        return await self.server.get_transaction(tx)  # type: ignore
+        if self.tx_cache is None:
+            return await self.server.get_transaction(tx)  # type: ignore
+        cached = await self.tx_cache.fetch(
+            (self.coin_name, tx), partial(self._load_tx_for_cache, tx), lambda data: data["block_height"] is not None
+        )
+        if cached["block_height"] is None:
+            return cached["tx"]  # type: ignore
+        confirmations = await self.get_block_height() - cached["block_height"] + 1
+        return {**cached["tx"], "confirmations": confirmations}
+
+    async def _load_tx_for_cache(self, tx: str) -> dict:
+        data = await self.server.get_transaction(tx)
+        confirmations = data.pop("confirmations", 0)
+        if confirmations < self.TX_CACHE_CONFIRMATIONS:
+            return {"tx": {**data, "confirmations": confirmations}, "block_height": None}
+        return {"tx": data, "block_height": await self.get_block_height() - confirmations + 1}
 
-    async def get_address(self, address: str) -> list:  # pragma: no cover
+    async def get_block_height(self) -> int:
+        """Get current blockchain height
+
+        Height from the last ``new_block`` event is used if it was received, otherwise daemon is asked for it
+
+        Returns:
+            int: blockchain height
+        """
+        if self._block_height is not None:
+            return self._block_height
+        return (await self.server.getinfo())["blockchain_height"]  # type: ignore
+
+    async def get_address(self, address: str, concurrency: int = 10) -> list:
         """Get address history
 
         This method should return list of transaction informations for specified address
@@ -115,14 +172,57 @@ class BTC(Coin, EventDelivery):
 
         Args:
             address (str): address to get transactions for
+            concurrency (int, optional): maximum number of transactions fetched at the same time. Defaults to 10.
 
         Returns:
             list: List of transactions
         """
-        out: list = await self.server.getaddresshistory(address)
-        for i in out:
-            i["tx"] = await self.get_tx(i["tx_hash"])
-        return out
+        return [item async for item in self.iter_address(address, concurrency=concurrency)]
+
+    async def iter_address(self, address: str, concurrency: int = 10) -> AsyncIterator[dict]:
+        """Iterate over address history
+
+        Same as :meth:`bitcart.coins.btc.BTC.get_address`, but yields transactions in order as soon as they are
+        fetched, which is useful for addresses with large histories
+
+        Up to ``concurrency`` transactions are fetched ahead of the consumer. If you stop iterating early,
+        close the iterator (i.e. via ``contextlib.aclosing``) to cancel them right away
+        instead of when the iterator is garbage collected.
+
+        Examples:
+            >>> async for item in c.iter_address("31smpLFzLnza6k8tJbVpxXiatGjiEQDmzc"):
+            ...     print(item["tx_hash"], item["tx"])
+
+            >>> async with aclosing(c.iter_address("31smpLFzLnza6k8tJbVpxXiatGjiEQDmzc")) as txes:
+            ...     async for item in txes:
+            ...         if item["height"] < 500000:
+            ...             break
+
+        Args:
+            address (str): address to get transactions for
+            concurrency (int, optional): maximum number of transactions fetched at the same time. Defaults to 10.
+
+        Returns:
+            AsyncIterator[dict]: transactions
+        """
+
+        async def fetch(item: dict) -> dict:
+            item["tx"] = await self.get_tx(item["tx_hash"])
+            return item
+
+        history: list = await self.server.getaddresshistory(address)
+        pending: deque[asyncio.Future] = deque()
+        try:
+            for item in history:
+                pending.append(asyncio.ensure_future(fetch(item)))
+                if len(pending) >= concurrency:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     async def balance(self) -> dict:
         """Get balance of wallet
@@ -224,28 +324,86 @@ class BTC(Coin, EventDelivery):
     async def _register_wallets(self, ws: "ClientWebSocketResponse") -> None:
         await ws.send_json({"xpub": self.xpub})
 
-    async def process_updates(self, updates: Iterable[dict], *args: Any, pass_instance: bool = False, **kwargs: Any) -> None:
+    async def _recover_missed_updates(self, *args: Any) -> None:
+        height = (await self.server.getinfo())["blockchain_height"]
+        updates = await self._get_missed_updates(height)
+        if updates:
+            await self.dispatcher.submit((self.coin_name, self.xpub), self.process_updates, updates, self.coin_name, self.xpub)
+
+    async def _get_missed_updates(self, height: int) -> list[dict]:
+        """Get updates which could have been missed since the last known block
+
+        On first call only the current height is remembered. Then, new transactions are found by comparing
+        wallet history since the last known block with transactions already delivered via events.
+        Unconfirmed transactions received before the cursor was set may be delivered too.
+
+        Args:
+            height (int): current blockchain height
+
+        Returns:
+            list[dict]: missed updates, in the same format as updates sent by daemon
+        """
+        last_height = max((h for h in (self._recovery_height, self._block_height) if h is not None), default=None)
+        self._recovery_height = height
+        if last_height is None:
+            return []
+        updates = []
+        if self.xpub:
+            history = await self.history()
+            transactions = history.get("transactions", []) if isinstance(history, dict) else history
+            for tx in transactions:
+                tx_hash = tx.get("txid") or tx.get("tx_hash")
+                tx_height = tx.get("height") or 0
+                if tx_hash and tx_hash not in self._seen_txes and (tx_height <= 0 or tx_height >= last_height):
+                    self._mark_seen(tx_hash)  # before processing, so that next recovery doesn't queue it again
+                    updates.append({"event": "new_transaction", "tx": tx_hash})
+        if height > last_height:
+            updates.append({"event": "new_block", "height": height})
+        return updates
+
+    def _mark_seen(self, tx_hash: str) -> None:
+        self._seen_txes[tx_hash] = None
+        if len(self._seen_txes) > self.SEEN_TXES_LIMIT:
+            del self._seen_txes[next(iter(self._seen_txes))]
+
+    async def process_updates(
+        self,
+        updates: Iterable[dict],
+        *args: Any,
+        pass_instance: bool = False,
+        handlers_source: EventDelivery | None = None,
+        **kwargs: Any,
+    ) -> None:
         if not isinstance(updates, list):
             logger.debug(f"Invalid updates passed: {updates}")
             return
+        deduplicator = (handlers_source and handlers_source.deduplicator) or self.deduplicator
         for event_info in updates:
             if not isinstance(event_info, dict):
                 logger.debug(f"{event_info} is not a dict")
                 continue
-            event = event_info.pop("event", None)
+            event = event_info.get("event")
             if not event or event not in self.ALLOWED_EVENTS:
                 logger.error(f"Invalid event from server: {event}")
                 continue
-            handler = self.event_handlers.get(event)
-            if handler:
-                handler_keys = inspect.signature(handler).parameters.keys()
-                args = (event,)
-                if pass_instance:
-                    args = (self,) + args
-                for arg in event_info.copy():
-                    if arg not in handler_keys:
-                        event_info.pop(arg)
-                await call_universal(handler, *args, **event_info)
+            if deduplicator and deduplicator.is_duplicate(deduplicator.event_key(self.coin_name, self.xpub, event_info)):
+                logger.debug(f"Dropping duplicate event: {event_info}")
+                continue
+            if event == "new_block" and isinstance(event_info.get("height"), int):
+                self._block_height = event_info["height"]
+            elif event == "new_transaction" and isinstance(event_info.get("tx"), str):
+                self._mark_seen(event_info["tx"])
+            plan = (handlers_source and handlers_source._get_handler_plan(event)) or self._get_handler_plan(event)
+            if plan:
+                await (handlers_source or self)._call_handlers(
+                    plan, event_info, *((self, event) if pass_instance else (event,))
+                )
+            if self._subscriptions or (handlers_source and handlers_source._subscriptions):
+                data = {key: value for key, value in event_info.items() if key != "event"}
+                event_obj = Event(event, data, self.coin_name, self.xpub)
+                for source in (handlers_source, self):
+                    if source is not None:
+                        await source._publish(event_obj)
 
     async def pay_to(
         self,
@@ -20,6 +20,11 @@ class ETH(BTC):
             f"Full address history lookup not implemented for {self.coin_name} to remain lightweight"
         )
 
+    def iter_address(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise NotImplementedError(  # pragma: no cover
+            f"Full address history lookup not implemented for {self.coin_name} to remain lightweight"
+        )
+
     async def pay_to_many(self, *args: Any, **kwargs: Any) -> NoReturn:
         raise NotImplementedError(f"Pay to many not available in {self.coin_name} directly")  # pragma: no cover
 
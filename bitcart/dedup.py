@@ -0,0 +1,66 @@
+import json
+import time
+from collections.abc import Hashable
+from typing import Any
+
+
+class Deduplicator:
+    """Drops events which were already seen recently
+
+    Keys are stored in two generations of sets, which are rotated every ``window`` seconds or when the current one
+    reaches ``max_size`` keys. So memory usage is bounded, and each key is remembered for at least ``window`` seconds,
+    unless more than ``max_size`` events are received in that time.
+
+    Examples:
+        >>> coin = BTC(xpub=xpub, deduplicator=Deduplicator(window=3600))
+        >>> coin.deduplicator.stats()
+        {'unique': 150, 'duplicates': 3, 'size': 150}
+
+    Args:
+        window (Union[int, float], optional): seconds to remember keys for. Defaults to 600.
+        max_size (int, optional): maximum number of keys in a generation. Defaults to 100000.
+    """
+
+    def __init__(self, window: int | float = 600, max_size: int = 100000):
+        self.window = window
+        self.max_size = max_size
+        self.unique = 0
+        self.duplicates = 0
+        self._current: set[Hashable] = set()
+        self._previous: set[Hashable] = set()
+        self._rotated_at = time.monotonic()
+
+    @staticmethod
+    def event_key(*args: Any) -> Hashable:
+        """Build a key from event payload and its source (i.e. currency and wallet)"""
+        return json.dumps(args, sort_keys=True, default=str)
+
+    def is_duplicate(self, key: Hashable) -> bool:
+        """Check whether key was seen recently, and remember it
+
+        Args:
+            key (Hashable): event key
+
+        Returns:
+            bool: True if key was already seen
+        """
+        now = time.monotonic()
+        if now - self._rotated_at >= self.window or len(self._current) >= self.max_size:
+            # keys older than two windows are forgotten
+            self._previous = set() if now - self._rotated_at >= 2 * self.window else self._current
+            self._current = set()
+            self._rotated_at = now
+        if key in self._current or key in self._previous:
+            self.duplicates += 1
+            return True
+        self._current.add(key)
+        self.unique += 1
+        return False
+
+    def stats(self) -> dict[str, int]:
+        """Get deduplication metrics
+
+        Returns:
+            dict[str, int]: counters and number of remembered keys
+        """
+        return {"unique": self.unique, "duplicates": self.duplicates, "size": len(self._current) + len(self._previous)}
@@ -0,0 +1,108 @@
+import asyncio
+import traceback
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from .logger import logger
+
+OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+
+class EventDispatcher:
+    """Bounded dispatcher of incoming updates
+
+    Updates are distributed between a fixed number of workers by key (i.e. currency and wallet),
+    so updates with the same key are processed in the order they were received,
+    while updates for different keys are processed concurrently.
+
+    When a worker queue is full, overflow policy is applied:
+
+    - ``block``: wait until there is free space, slowing down reading from the websocket
+    - ``drop_oldest``: drop the oldest queued update
+
+    Args:
+        workers (int, optional): number of workers. Defaults to 16.
+        maxsize (int, optional): maximum number of queued updates per worker. Defaults to 1000.
+        overflow (str, optional): overflow policy, either ``block`` or ``drop_oldest``. Defaults to ``block``.
+    """
+
+    def __init__(self, workers: int = 16, maxsize: int = 1000, overflow: str = "block"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow}, must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self.workers = workers
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.processed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queues: list[asyncio.Queue] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queues = [asyncio.Queue(self.maxsize) for _ in range(self.workers)]
+        self._tasks = [loop.create_task(self._worker(queue)) for queue in self._queues]
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            func, args = await queue.get()
+            try:
+                await func(*args)
+            except Exception:
+                logger.error(f"Error occured during updates processing:\n{traceback.format_exc()}")
+            finally:
+                self.processed += 1
+                queue.task_done()
+
+    async def submit(self, key: Hashable, func: Callable, *args: Any) -> None:
+        """Queue a coroutine function to be called with args by the worker responsible for the key
+
+        Args:
+            key (Hashable): ordering key, calls with the same key are run sequentially
+            func (Callable): coroutine function to call
+        """
+        self._start()
+        queue = self._queues[hash(key) % self.workers]
+        if queue.full() and self.overflow == "drop_oldest":
+            queue.get_nowait()
+            queue.task_done()
+            self.dropped += 1
+        await queue.put((func, args))
+        self.max_depth = max(self.max_depth, queue.qsize())
+
+    async def join(self) -> None:
+        """Wait until all queued updates are processed"""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    async def close(self, wait: bool = True) -> None:
+        """Stop all workers
+
+        Args:
+            wait (bool, optional): whether to process already queued updates first. Defaults to True.
+        """
+        if wait:
+            await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queues = []
+
+    def stats(self) -> dict[str, Any]:
+        """Get dispatcher metrics
+
+        Returns:
+            dict[str, Any]: queue depths and counters
+        """
+        depths = [queue.qsize() for queue in self._queues]
+        return {
+            "depth": sum(depths),
+            "depths": depths,
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "dropped": self.dropped,
+        }
@@ -1,15 +1,23 @@
 import asyncio
+import inspect
+import time
 import traceback
-from collections.abc import Callable, Iterable
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from contextlib import contextmanager
 from json import JSONDecodeError
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urljoin
 
 from aiohttp import ClientConnectionError, WSMsgType
 
+from .backoff import Backoff
+from .dedup import Deduplicator
+from .dispatch import EventDispatcher
 from .errors import ConnectionFailedError
+from .executor import HandlerExecutor
 from .logger import logger
-from .utils import call_universal
+from .types import Event
+from .utils import call_universal, get_handler_params
 
 if TYPE_CHECKING:
     from aiohttp import ClientWebSocketResponse
@@ -17,9 +25,87 @@ if TYPE_CHECKING:
     from .providers.jsonrpcrequests import RPCProxy
 
 
+def _to_filter(values: Iterable[str] | str | None) -> frozenset[str] | None:
+    if values is None:
+        return None
+    return frozenset([values] if isinstance(values, str) else values)
+
+
+HANDLER_MODES = ("sequential", "concurrent", "thread")
+
+HandlerPlan = list[tuple[Callable, frozenset[str], int | float | None]]
+
+
 class EventDelivery:
     server: "RPCProxy"
-    event_handlers: dict[str, Callable]
+    event_handlers: dict[str, list[Callable]]
+
+    def __init__(
+        self,
+        dispatcher: EventDispatcher | None = None,
+        deduplicator: Deduplicator | None = None,
+        handler_mode: str = "sequential",
+        handler_executor: HandlerExecutor | None = None,
+    ) -> None:
+        if handler_mode not in HANDLER_MODES:
+            raise ValueError(f"Invalid handler mode: {handler_mode}, must be one of {', '.join(HANDLER_MODES)}")
+        self.dispatcher = dispatcher or EventDispatcher()
+        self.deduplicator = deduplicator
+        self.handler_mode = handler_mode
+        self.handler_executor = handler_executor
+        self._subscriptions: list[tuple[asyncio.Queue, frozenset[str] | None, frozenset[str] | None]] = []
+        self._handler_plans: dict[str, tuple[tuple[Callable, ...], HandlerPlan]] = {}
+        self._handler_info: dict[Callable, tuple[frozenset[str], int | float | None]] = {}
+        self._connection_stats: dict[str, int | float] = {
+            "connects": 0,
+            "disconnects": 0,
+            "reconnect_attempts": 0,
+            "downtime": 0.0,
+            "last_downtime": 0.0,
+        }
+
+    def _get_handler_plan(self, event: str) -> HandlerPlan | None:
+        handlers = self.event_handlers.get(event)
+        if not handlers:
+            return None
+        funcs = (handlers,) if callable(handlers) else tuple(handlers)
+        cached = self._handler_plans.get(event)
+        if cached is None or cached[0] != funcs:  # event_handlers were modified directly
+            plan = [(func, *self._get_handler_info(func)) for func in funcs]
+            cached = self._handler_plans[event] = (funcs, plan)
+        return cached[1]
+
+    def _get_handler_info(self, func: Callable) -> tuple[frozenset[str], int | float | None]:
+        info = self._handler_info.get(func)
+        if info is None:
+            info = (get_handler_params(func), None)
+        return info
+
+    async def _run_handler(self, func: Callable, handler_timeout: int | float | None, *args: Any, **kwargs: Any) -> None:
+        if inspect.iscoroutinefunction(func):
+            call = call_universal(func, *args, **kwargs)
+        elif self.handler_executor is not None:
+            call = call_universal(self.handler_executor.run, func, *args, **kwargs)
+        elif self.handler_mode == "thread":
+            call = call_universal(asyncio.to_thread, func, *args, **kwargs)
+        else:
+            call = call_universal(func, *args, **kwargs)
+        try:
+            async with asyncio.timeout(handler_timeout):
+                await call
+        except TimeoutError:
+            logger.error(f"Event handler {func!r} timed out after {handler_timeout} seconds")
+
+    async def _call_handlers(self, plan: HandlerPlan, event_info: dict, *args: Any) -> None:
+        calls = []
+        for func, params, timeout in plan:
+            kwargs = {key: value for key, value in event_info.items() if key != "event" and key in params}
+            calls.append(self._run_handler(func, timeout, *args, **kwargs))
+        if self.handler_mode == "sequential":
+            for call in calls:
+                await call
+        else:
+            await asyncio.gather(*calls)
 
     async def process_updates(self, updates: Iterable[dict], currency: str | None = None, wallet: str | None = None) -> None:
         raise NotImplementedError()  # pragma: no cover
@@ -27,6 +113,9 @@ class EventDelivery:
     async def _register_wallets(self, ws: "ClientWebSocketResponse") -> None:
         raise NotImplementedError()  # pragma: no cover
 
+    async def _recover_missed_updates(self, *args: Any) -> None:
+        raise NotImplementedError()  # pragma: no cover
+
     async def _start_websocket_processing(
         self, ws: "ClientWebSocketResponse", reconnect_callback: Callable | None = None
     ) -> None:
@@ -37,11 +126,12 @@ class EventDelivery:
             if msg.type == WSMsgType.TEXT:
                 try:
                     data = msg.json()
-                    asyncio.ensure_future(
-                        self.process_updates(data.get("updates", []), data.get("currency", "BTC"), data.get("wallet"))
-                    )
                 except JSONDecodeError:
-                    pass
+                    continue
+                currency, wallet = data.get("currency", "BTC"), data.get("wallet")
+                await self.dispatcher.submit(
+                    (currency, wallet), self.process_updates, data.get("updates", []), currency, wallet
+                )
             elif msg.type == WSMsgType.CLOSED or msg.type == WSMsgType.ERROR:  # pragma: no cover
                 break
 
@@ -55,70 +145,314 @@ class EventDelivery:
         reconnect_callback: Callable | None = None,
         force_connect: bool = False,
         auto_reconnect: bool = True,
+        backoff: Backoff | None = None,
+        reconnect_attempt_callback: Callable | None = None,
+        recover_missed: bool = False,
     ) -> None:
+        backoff = backoff or Backoff()
         first = True
+        attempt = 0
+        connected_at: float | None = None
+        disconnected_at: float | None = None
+
+        async def on_connect(*args: Any) -> None:
+            nonlocal connected_at, disconnected_at
+            if connected_at is None:
+                connected_at = time.monotonic()
+                self._record_connect(connected_at, disconnected_at)
+                disconnected_at = None
+            if recover_missed:
+                await self._try_recover_missed_updates(*args)
+            if reconnect_callback:
+                await call_universal(reconnect_callback, *args)
+
         while True:
+            connected_at = None
             try:
-                await func(reconnect_callback=reconnect_callback)
+                await func(reconnect_callback=on_connect)
             except ClientConnectionError as e:
                 if first and not force_connect:
                     raise ConnectionFailedError() from e
             first = False
             if not auto_reconnect:
                 break
-            await asyncio.sleep(5)  # wait a bit before re-estabilishing a connection # pragma: no cover
+            if connected_at is not None:  # connection was lost
+                disconnected_at = time.monotonic()
+                self._connection_stats["disconnects"] += 1
+                if disconnected_at - connected_at >= backoff.initial:
+                    attempt = 0  # retry right away, unless connection is dropped immediately every time
+            delay = backoff.delay(attempt) if attempt else 0
+            attempt += 1
+            self._connection_stats["reconnect_attempts"] += 1
+            if reconnect_attempt_callback:
+                await call_universal(reconnect_attempt_callback, attempt, delay)
+            await asyncio.sleep(delay)
+
+    def _record_connect(self, connected_at: float, disconnected_at: float | None) -> None:
+        self._connection_stats["connects"] += 1
+        if disconnected_at is not None:
+            downtime = connected_at - disconnected_at
+            self._connection_stats["downtime"] += downtime
+            self._connection_stats["last_downtime"] = downtime
+
+    async def _try_recover_missed_updates(self, *args: Any) -> None:
+        try:
+            await self._recover_missed_updates(*args)
+        except Exception:
+            logger.error(f"Error occured during missed updates recovery:\n{traceback.format_exc()}")
+
+    def connection_stats(self) -> dict[str, int | float]:
+        """Get websocket connection metrics
+
+        Examples:
+            >>> coin.connection_stats()
+            {'connects': 2, 'disconnects': 1, 'reconnect_attempts': 3, 'downtime': 4.2, 'last_downtime': 4.2}
+
+        Returns:
+            dict[str, Union[int, float]]: counters, downtime is in seconds
+        """
+        return dict(self._connection_stats)
 
     async def start_websocket(
-        self, reconnect_callback: Callable | None = None, force_connect: bool = False, auto_reconnect: bool = True
+        self,
+        reconnect_callback: Callable | None = None,
+        force_connect: bool = False,
+        auto_reconnect: bool = True,
+        backoff: Backoff | None = None,
+        reconnect_attempt_callback: Callable | None = None,
+        recover_missed: bool = False,
     ) -> None:
         """Start a websocket connection to daemon
 
+        When connection is lost, first reconnect attempt is made right away,
+        next ones are delayed according to the backoff policy.
+
         Args:
             reconnect_callback (Optional[Callable], optional): Callback to be called right after
                 each succesful connection. Defaults to None.
             force_connect (bool, optional): Whether to try reconnecting even on first failure (handshake)
                 to daemon. Defaults to False.
             auto_reconnect (bool, optional): Whether to enable auto-reconnecting on websocket closing. Defaults to True.
+            backoff (Optional[Backoff], optional): delays between reconnect attempts.
+                Defaults to exponential backoff from 1 to 60 seconds with full jitter.
+            reconnect_attempt_callback (Optional[Callable], optional): Callback to be called with attempt number and
+                delay in seconds before each reconnect attempt. Defaults to None.
+            recover_missed (bool, optional): Whether to deliver updates missed while disconnected after reconnecting,
+                before live updates. Defaults to False.
         """
-        await self._websocket_base_loop(
-            self._start_websocket_inner,
-            reconnect_callback=reconnect_callback,
-            force_connect=force_connect,
-            auto_reconnect=auto_reconnect,
-        )
+        try:
+            await self._websocket_base_loop(
+                self._start_websocket_inner,
+                reconnect_callback=reconnect_callback,
+                force_connect=force_connect,
+                auto_reconnect=auto_reconnect,
+                backoff=backoff,
+                reconnect_attempt_callback=reconnect_attempt_callback,
+                recover_missed=recover_missed,
+            )
+        finally:
+            await self._stop_dispatcher()
+
+    async def _stop_dispatcher(self) -> None:
+        # process already received updates, unless we are being cancelled
+        cancelling = (task := asyncio.current_task()) is not None and task.cancelling() > 0
+        await self.dispatcher.close(wait=not cancelling)
+
+    async def close(self) -> None:
+        """Stop processing of updates, waiting for already received updates to be processed"""
+        await self.dispatcher.close()
+        if self.handler_executor is not None:
+            await self.handler_executor.close()
+
+    @contextmanager
+    def _subscribe(
+        self, events: Iterable[str] | str | None, wallets: Iterable[str] | str | None, maxsize: int
+    ) -> Iterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+        subscription = (queue, _to_filter(events), _to_filter(wallets))
+        self._subscriptions.append(subscription)
+        try:
+            yield queue
+        finally:
+            self._subscriptions.remove(subscription)
+
+    async def _publish(self, event: Event) -> None:
+        for queue, events, wallets in list(self._subscriptions):
+            if (events is None or event.event in events) and (wallets is None or event.wallet in wallets):
+                await queue.put(event)
+
+    async def events(
+        self, events: Iterable[str] | str | None = None, wallets: Iterable[str] | str | None = None, maxsize: int = 1000
+    ) -> AsyncIterator[Event]:
+        """Iterate over incoming events
+
+        Events must be received by :meth:`start_websocket` or :meth:`poll_updates` running concurrently.
+        Events are put into a bounded queue of the iterator, when it is full, updates processing waits for free space.
+        Only events received after iteration has started are yielded.
+
+        Examples:
+            >>> async for event in coin.events("new_payment"):
+            ...     print(event.data["address"], event.data["status"])
+
+        Args:
+            events (Optional[Union[Iterable[str], str]], optional): event name(s) to receive. Defaults to all events.
+            wallets (Optional[Union[Iterable[str], str]], optional): wallet(s) to receive events for.
+                Defaults to all wallets.
+            maxsize (int, optional): maximum number of queued events. Defaults to 1000.
 
-    async def poll_updates(self, interval: int | float = 1) -> None:  # pragma: no cover
+        Yields:
+            Event: received event
+        """
+        with self._subscribe(events, wallets, maxsize) as queue:
+            while True:
+                yield await queue.get()
+
+    async def event_batches(
+        self,
+        events: Iterable[str] | str | None = None,
+        wallets: Iterable[str] | str | None = None,
+        max_size: int = 100,
+        max_wait: int | float = 1,
+        maxsize: int = 1000,
+    ) -> AsyncIterator[list[Event]]:
+        """Iterate over batches of incoming events
+
+        Same as :meth:`events`, but waits for up to ``max_wait`` seconds after the first event
+        to collect up to ``max_size`` events, i.e. to save them in one database transaction.
+
+        Examples:
+            >>> async for batch in coin.event_batches("new_payment", max_size=500):
+            ...     await save_payments(batch)
+
+        Args:
+            events (Optional[Union[Iterable[str], str]], optional): event name(s) to receive. Defaults to all events.
+            wallets (Optional[Union[Iterable[str], str]], optional): wallet(s) to receive events for.
+                Defaults to all wallets.
+            max_size (int, optional): maximum number of events in a batch. Defaults to 100.
+            max_wait (Union[int, float], optional): seconds to wait for the batch to fill up. Defaults to 1.
+            maxsize (int, optional): maximum number of queued events. Defaults to 1000.
+
+        Yields:
+            list[Event]: non-empty batch of events
+        """
+        loop = asyncio.get_running_loop()
+        with self._subscribe(events, wallets, maxsize) as queue:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + max_wait
+                while len(batch) < max_size and (timeout := deadline - loop.time()) > 0:
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except TimeoutError:
+                        break
+                yield batch
+
+    async def _poll_loop(
+        self,
+        fetch: Callable,
+        process: Callable,
+        interval: int | float,
+        min_interval: int | float | None,
+        max_interval: int | float | None,
+        long_poll_timeout: int | float | None,
+        backoff: Backoff | None,
+    ) -> None:
+        min_interval = interval if min_interval is None else min_interval
+        max_interval = interval if max_interval is None else max_interval
+        backoff = backoff or Backoff(initial=interval)
+        delay = interval
+        errors = 0
+        while True:
+            try:
+                data = await (fetch(timeout=long_poll_timeout) if long_poll_timeout else fetch())
+            except Exception:
+                logger.error(f"Error occured during event polling:\n{traceback.format_exc()}")
+                errors += 1
+                await asyncio.sleep(backoff.delay(errors))
+                continue
+            errors = 0
+            await process(data)
+            if long_poll_timeout:
+                continue  # daemon already waited for updates
+            # poll more often while updates are coming, and less often when idle
+            delay = max(min_interval, delay / 2) if data else min(max_interval, delay * 2)
+            await asyncio.sleep(delay)
+
+    async def poll_updates(
+        self,
+        interval: int | float = 1,
+        min_interval: int | float | None = None,
+        max_interval: int | float | None = None,
+        long_poll_timeout: int | float | None = None,
+        backoff: Backoff | None = None,
+    ) -> None:
         """Poll updates
 
         Poll daemon for new transactions in wallet,
         this will block forever in while True loop checking for new transactions
 
+        If ``min_interval`` or ``max_interval`` are set, polling interval is adaptive: it is halved (down to
+        ``min_interval``) each time updates are received, and doubled (up to ``max_interval``) each time there are none.
+        After errors, polling is retried with exponential backoff.
+
         Example can be found on main page of docs
 
         Args:
             self (BTC): self
             interval (Union[int, float], optional): seconds to wait before requesting transactions again. Defaults to 1.
+            min_interval (Optional[Union[int, float]], optional): minimum adaptive interval. Defaults to interval.
+            max_interval (Optional[Union[int, float]], optional): maximum adaptive interval. Defaults to interval.
+            long_poll_timeout (Optional[Union[int, float]], optional): if set, daemon is asked to wait for updates
+                for up to this number of seconds, and next request is sent right after the response.
+                Requires daemon support. Defaults to None.
+            backoff (Optional[Backoff], optional): delays between retries after errors.
+                Defaults to exponential backoff starting from interval.
 
         Returns:
             None: This function runs forever
         """
-        while True:
-            try:
-                data = await self.server.get_updates()
-            except Exception:
-                logger.error(f"Error occured during event polling:\n{traceback.format_exc()}")
-                await asyncio.sleep(interval)
-                continue
-            await self.process_updates(data)
-            await asyncio.sleep(interval)
+        await self._poll_loop(
+            self.server.get_updates,
+            self.process_updates,
+            interval=interval,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            long_poll_timeout=long_poll_timeout,
+            backoff=backoff,
+        )
 
-    def add_event_handler(self, events: Iterable[str] | str, func: Callable) -> None:
+    def add_event_handler(self, events: Iterable[str] | str, func: Callable, timeout: int | float | None = None) -> None:
         """Add event handler to handle event(s) provided
 
+        Multiple handlers can be added for the same event, they are run in order they were added,
+        or concurrently, depending on ``handler_mode``.
+
         Args:
             self (BTC): self
             events (Union[Iterable[str], str]): event or events
             func (Callable): function to handle those
+            timeout (Optional[Union[int, float]], optional): seconds to wait for the handler to finish, after that it
+                is cancelled and error is logged. Sync handlers can only be interrupted in ``thread`` mode.
+                Defaults to None (no timeout).
+
+        Returns:
+            None: None
+        """
+        if isinstance(events, str):
+            events = [events]
+        self._handler_info[func] = (get_handler_params(func), timeout)
+        for event in events:
+            handlers = self.event_handlers.setdefault(event, [])
+            if func not in handlers:
+                handlers.append(func)
+
+    def remove_event_handler(self, events: Iterable[str] | str, func: Callable) -> None:
+        """Remove event handler added by :meth:`add_event_handler`
+
+        Args:
+            self (BTC): self
+            events (Union[Iterable[str], str]): event or events
+            func (Callable): handler to remove
 
         Returns:
             None: None
@@ -126,9 +460,13 @@ class EventDelivery:
         if isinstance(events, str):
             events = [events]
         for event in events:
-            self.event_handlers[event] = func
+            handlers = self.event_handlers.get(event, [])
+            if func in handlers:
+                handlers.remove(func)
+        if not any(func in handlers for handlers in self.event_handlers.values()):
+            self._handler_info.pop(func, None)
 
-    def on(self, events: Iterable[str] | str) -> Callable:
+    def on(self, events: Iterable[str] | str, timeout: int | float | None = None) -> Callable:
         """Register on event
 
         Register callback function to be run when event is emmited
@@ -151,13 +489,15 @@ class EventDelivery:
         Args:
             self (BTC): self
             events (Union[Iterable[str], str]): event name or list of events for function to be run on
+            timeout (Optional[Union[int, float]], optional): seconds to wait for the handler to finish.
+                Defaults to None (no timeout).
 
         Returns:
             Callable: It is a decorator
         """
 
         def wrapper(f: Callable) -> Callable:
-            self.add_event_handler(events, f)
+            self.add_event_handler(events, f, timeout=timeout)
             return f
 
         return wrapper
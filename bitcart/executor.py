@@ -0,0 +1,95 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+def _timed_call(submitted_at: float, func: Callable, *args: Any, **kwargs: Any) -> tuple[float, Any]:
+    # wall clock is used because monotonic clocks are not comparable between processes
+    return time.time() - submitted_at, func(*args, **kwargs)
+
+
+class HandlerExecutor:
+    """Pool running synchronous event handlers outside of the event loop
+
+    When passed to coin or APIManager constructor, all sync event handlers are run in the pool,
+    so that blocking handlers (i.e. database writes) don't stop processing of other updates.
+
+    With process pool, handlers and their arguments must be picklable: use module-level functions,
+    and don't use it with APIManager handlers, which receive the coin instance.
+
+    Examples:
+        >>> coin = BTC(xpub=xpub, handler_executor=HandlerExecutor(max_workers=4))
+        >>> coin.handler_executor.stats()
+        {'submitted': 10, 'completed': 9, 'failed': 0, 'pending': 1, 'queue_time_avg': 0.002, 'queue_time_max': 0.01}
+
+    Args:
+        kind (str, optional): pool kind, either ``thread`` or ``process``. Defaults to ``thread``.
+        max_workers (Optional[int], optional): pool size. Defaults to the concurrent.futures default.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int | None = None):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Invalid executor kind: {kind}, must be one of {', '.join(EXECUTOR_KINDS)}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            executor_class = ThreadPoolExecutor if self.kind == "thread" else ProcessPoolExecutor
+            self._executor = executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a sync function in the pool
+
+        Args:
+            func (Callable): function to run
+
+        Returns:
+            Any: function result
+        """
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        try:
+            queue_time, result = await loop.run_in_executor(
+                self._get_executor(), partial(_timed_call, time.time(), func, *args, **kwargs)
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        return result
+
+    async def close(self) -> None:
+        """Wait for running handlers to finish and shut down the pool. It is recreated if used again"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown)
+
+    def stats(self) -> dict[str, int | float]:
+        """Get executor metrics
+
+        Returns:
+            dict[str, Union[int, float]]: counters and time spent by handlers waiting in the pool queue, in seconds
+        """
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": self.submitted - self.completed - self.failed,
+            "queue_time_avg": self.queue_time_total / self.completed if self.completed else 0.0,
+            "queue_time_max": self.queue_time_max,
+        }
@@ -6,10 +6,16 @@ from urllib.parse import urljoin
 
 from bitcart.errors import CurrencyUnsupportedError, NoCurrenciesRegisteredError
 
+from .backoff import Backoff
 from .coins import COINS
+from .dedup import Deduplicator
+from .dispatch import EventDispatcher
 from .event_delivery import EventDelivery
+from .executor import HandlerExecutor
 from .logger import logger
+from .providers.pool import ConnectionPool
 from .types import ExtendedDefaultDict, ExtendedDict
+from .utils import call_universal
 
 if TYPE_CHECKING:
     from aiohttp import ClientWebSocketResponse
@@ -19,13 +25,28 @@ if TYPE_CHECKING:
 
 
 class APIManager(EventDelivery):
-    def __init__(self, wallets: dict[str, Iterable[str]] | None = None, custom_params: dict[str, dict] | None = None):
+    def __init__(
+        self,
+        wallets: dict[str, Iterable[str]] | None = None,
+        custom_params: dict[str, dict] | None = None,
+        pool: ConnectionPool | None = None,
+        dispatcher: EventDispatcher | None = None,
+        deduplicator: Deduplicator | None = None,
+        handler_mode: str = "sequential",
+        handler_executor: HandlerExecutor | None = None,
+    ):
         if custom_params is None:
             custom_params = {}
         if wallets is None:
             wallets = {}
-        super().__init__()
+        super().__init__(
+            dispatcher=dispatcher,
+            deduplicator=deduplicator,
+            handler_mode=handler_mode,
+            handler_executor=handler_executor,
+        )
         self.custom_params = custom_params
+        self.pool = pool or ConnectionPool()
         self.wallets = ExtendedDefaultDict(
             lambda: ExtendedDict(),
             {currency: self.load_wallets(currency, wallets) for currency, wallets in wallets.items()},
@@ -39,7 +60,7 @@ class APIManager(EventDelivery):
         currency = currency.upper()
         if currency not in COINS:
             raise CurrencyUnsupportedError()
-        return COINS[currency](xpub=wallet, **self.custom_params.get(currency, {}))
+        return COINS[currency](xpub=wallet, **{"pool": self.pool, **self.custom_params.get(currency, {})})
 
     def add_wallet(self, currency: str, wallet: str) -> None:
         self.wallets[currency][wallet] = self.load_wallet(currency, wallet)
@@ -47,15 +68,17 @@ class APIManager(EventDelivery):
     def add_wallets(self, currency: str, wallets: Iterable[str]) -> None:
         self.wallets[currency].update(self.load_wallets(currency, wallets))
 
+    async def close(self) -> None:
+        """Stop processing of updates and close all connections opened by the manager's wallets"""
+        await super().close()
+        await self.pool.close()
+
     def __getitem__(self, key: str) -> Any:
         return self.wallets.__getitem__(key)
 
     def __getattr__(self, key: str) -> Any:
         return self.__getitem__(key)
 
-    def _merge_event_handlers(self, wallet: "Coin") -> None:
-        wallet.event_handlers.update(self.event_handlers)
-
     async def _register_wallets(self, ws: "ClientWebSocketResponse") -> None:
         pass  # listen on all wallets
 
@@ -66,12 +89,38 @@ class APIManager(EventDelivery):
             coin = self.load_wallet(currency, None)
         return coin.server  # type: ignore
 
-    async def _start_websocket_for_currency(self, currency: str, reconnect_callback: Callable | None = None) -> None:
+    def _get_websocket_endpoints(self) -> dict[tuple[str, str | None, str | None], list[str]]:
+        endpoints: dict[tuple[str, str | None, str | None], list[str]] = {}
+        for currency in self.wallets:
+            server = self._get_websocket_server(currency)
+            key = (server.url, getattr(server, "username", None), getattr(server, "password", None))
+            endpoints.setdefault(key, []).append(currency)
+        return endpoints
+
+    async def _recover_missed_updates(self, currency: str) -> None:
+        wallets = self.wallets[currency]
+        if not wallets:
+            return
+        height = (await self._get_websocket_server(currency).getinfo())["blockchain_height"]
+        for wallet, coin in wallets.items():
+            updates = await coin._get_missed_updates(height)
+            if updates:
+                await self.dispatcher.submit((currency, wallet), self.process_updates, updates, currency, wallet)
+
+    async def _start_websocket_for_currencies(self, currencies: list[str], reconnect_callback: Callable | None = None) -> None:
+        callback = None
         if reconnect_callback:
-            reconnect_callback = partial(reconnect_callback, currency)
-        server = self._get_websocket_server(currency)
+
+            async def callback() -> None:
+                for currency in currencies:
+                    await call_universal(reconnect_callback, currency)
+
+        server = self._get_websocket_server(currencies[0])
         async with server.session.ws_connect(urljoin(server.url, "/ws")) as ws:
-            await self._start_websocket_processing(ws, reconnect_callback=reconnect_callback)
+            await self._start_websocket_processing(ws, reconnect_callback=callback)
+
+    async def _start_websocket_for_currency(self, currency: str, reconnect_callback: Callable | None = None) -> None:
+        await self._start_websocket_for_currencies([currency], reconnect_callback=reconnect_callback)
 
     async def start_websocket_for_currency(
         self,
@@ -79,27 +128,98 @@ class APIManager(EventDelivery):
         reconnect_callback: Callable | None = None,
         force_connect: bool = False,
         auto_reconnect: bool = True,
+        backoff: Backoff | None = None,
+        reconnect_attempt_callback: Callable | None = None,
+        recover_missed: bool = False,
     ) -> None:
         await self._websocket_base_loop(
             partial(self._start_websocket_for_currency, currency=currency),
             reconnect_callback=reconnect_callback,
             force_connect=force_connect,
             auto_reconnect=auto_reconnect,
+            backoff=backoff,
+            reconnect_attempt_callback=reconnect_attempt_callback,
+            recover_missed=recover_missed,
         )
 
     async def start_websocket(
-        self, reconnect_callback: Callable | None = None, force_connect: bool = False, auto_reconnect: bool = True
+        self,
+        reconnect_callback: Callable | None = None,
+        force_connect: bool = False,
+        auto_reconnect: bool = True,
+        backoff: Backoff | None = None,
+        reconnect_attempt_callback: Callable | None = None,
+        recover_missed: bool = False,
     ) -> None:
+        """Start websocket connections to daemons of all registered currencies
+
+        Currencies served by the same daemon (same url and credentials) share one websocket connection,
+        incoming updates are routed to wallets by their currency and wallet fields.
+
+        Args:
+            reconnect_callback (Optional[Callable], optional): Callback to be called with currency right after
+                each succesful connection. Defaults to None.
+            force_connect (bool, optional): Whether to try reconnecting even on first failure (handshake)
+                to daemon. Defaults to False.
+            auto_reconnect (bool, optional): Whether to enable auto-reconnecting on websocket closing. Defaults to True.
+            backoff (Optional[Backoff], optional): delays between reconnect attempts.
+                Defaults to exponential backoff from 1 to 60 seconds with full jitter.
+            reconnect_attempt_callback (Optional[Callable], optional): Callback to be called with attempt number and
+                delay in seconds before each reconnect attempt. Defaults to None.
+            recover_missed (bool, optional): Whether to deliver updates missed while disconnected after reconnecting,
+                before live updates. Defaults to False.
+        """
         tasks = []
-        for currency in self.wallets:
+        for currencies in self._get_websocket_endpoints().values():
             tasks.append(
-                self.start_websocket_for_currency(
-                    currency, reconnect_callback=reconnect_callback, force_connect=force_connect, auto_reconnect=auto_reconnect
+                self._websocket_base_loop(
+                    partial(self._start_websocket_for_currencies, currencies),
+                    reconnect_callback=reconnect_callback,
+                    force_connect=force_connect,
+                    auto_reconnect=auto_reconnect,
+                    backoff=backoff,
+                    reconnect_attempt_callback=reconnect_attempt_callback,
+                    recover_missed=recover_missed,
                 )
             )
-        await asyncio.gather(*tasks)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await self._stop_dispatcher()
+        if not tasks:
+            raise NoCurrenciesRegisteredError()
+
+    async def poll_updates(
+        self,
+        interval: int | float = 1,
+        min_interval: int | float | None = None,
+        max_interval: int | float | None = None,
+        long_poll_timeout: int | float | None = None,
+        backoff: Backoff | None = None,
+    ) -> None:
+        """Poll updates of all registered wallets concurrently
+
+        See :meth:`bitcart.coins.btc.BTC.poll_updates` for arguments description, each wallet is polled independently.
+
+        Returns:
+            None: This function runs forever
+        """
+        tasks = [
+            self._poll_loop(
+                coin.server.get_updates,
+                partial(self.process_updates, currency=currency, wallet=wallet),
+                interval=interval,
+                min_interval=min_interval,
+                max_interval=max_interval,
+                long_poll_timeout=long_poll_timeout,
+                backoff=backoff,
+            )
+            for currency, wallets in self.wallets.items()
+            for wallet, coin in wallets.items()
+        ]
         if not tasks:
             raise NoCurrenciesRegisteredError()
+        await asyncio.gather(*tasks)
 
     async def process_updates(self, updates: Iterable[dict], currency: str | None = None, wallet: str | None = None) -> None:
         wallet_obj = self.wallets[currency].get(wallet)
@@ -109,5 +229,4 @@ class APIManager(EventDelivery):
             except CurrencyUnsupportedError:
                 logger.error(f"Received event for unsupported currency: {currency}")
                 return
-        self._merge_event_handlers(wallet_obj)
-        await wallet_obj.process_updates(updates, pass_instance=True)
+        await wallet_obj.process_updates(updates, pass_instance=True, handlers_source=self)
@@ -0,0 +1,71 @@
+import json
+from decimal import Decimal
+from typing import Any
+
+from ..utils import CustomJSONEncoder
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """Encodes requests and decodes responses using standard library json module"""
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, cls=CustomJSONEncoder).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """Codec based on msgspec, requires msgspec to be installed"""
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder(enc_hook=_encode_default)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec based on orjson, requires orjson to be installed
+
+    Note that orjson decodes integers larger than 64 bits as floats, so don't use it with daemons
+    returning big integers (i.e. amounts in wei)
+    """
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._orjson.dumps(obj, default=_encode_default)
+        except TypeError:  # i.e. integers larger than 64 bits
+            return super().dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+def get_default_codec() -> JSONCodec:
+    """Get the fastest lossless codec available: msgspec if installed, standard library json otherwise
+
+    Returns:
+        JSONCodec: codec instance
+    """
+    try:
+        return MsgspecCodec()
+    except ImportError:
+        return JSONCodec()
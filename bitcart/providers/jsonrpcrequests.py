@@ -6,11 +6,12 @@ from typing import Any
 from urllib.parse import urljoin
 
 import aiohttp
-from jsonrpcclient import Ok, parse_json, request
+from jsonrpcclient import Error, Ok, parse, request
 from universalasync import async_to_sync_wraps, get_event_loop
 
 from ..errors import ConnectionFailedError, UnknownError, generate_exception
-from ..utils import json_encode
+from .codecs import JSONCodec, get_default_codec
+from .pool import ConnectionPool, _cleanup_sessions
 
 
 def create_request(method: str, *args: Any, **kwargs: Any) -> dict:
@@ -26,19 +27,34 @@ def create_request(method: str, *args: Any, **kwargs: Any) -> dict:
     return request(method, params)  # type: ignore
 
 
-def _cleanup_sessions(sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession]) -> None:
-    loop = get_event_loop()
-    for session in list(sessions.values()):
-        if session is None or session.closed:
-            continue
-        if loop.is_running():
-            loop.create_task(session.close())
-        else:
-            loop.run_until_complete(session.close())
-    sessions.clear()
+def _set_exception(future: asyncio.Future, exc: BaseException) -> None:
+    future.set_exception(exc)
+    # mark exception as retrieved, so that unawaited batch futures don't log "exception was never retrieved"
+    future.exception()
 
 
 class RPCProxy:
+    """JSON-RPC client for the daemon
+
+    Any attribute access is converted to a remote call, e.g. ``proxy.getbalance()``
+
+    Args:
+        url (str): daemon url
+        username (Optional[str], optional): daemon user. Defaults to None.
+        password (Optional[str], optional): daemon password. Defaults to None.
+        xpub (Optional[str], optional): wallet passed with every call. Defaults to None.
+        session (Optional[aiohttp.ClientSession], optional): session to use instead of creating one. Defaults to None.
+        proxy (Optional[str], optional): proxy url, requires aiohttp_socks. Defaults to None.
+        verify (Optional[bool], optional): whether to verify SSL certificates. Defaults to True.
+        pool (Optional[ConnectionPool], optional): pool to get shared sessions from. Defaults to None.
+        batch_window (Optional[Union[int, float]], optional): if set, calls made concurrently within this number of
+            seconds are merged into one JSON-RPC batch request. Defaults to None.
+        max_batch_size (int, optional): maximum number of calls merged into one batch, the batch is sent immediately
+            when it is reached. Defaults to 100.
+        codec (Optional[JSONCodec], optional): codec to encode requests and decode responses with.
+            Defaults to the fastest one installed, see :func:`bitcart.providers.codecs.get_default_codec`.
+    """
+
     def __init__(
         self,
         url: str,
@@ -48,6 +64,10 @@ class RPCProxy:
         session: aiohttp.ClientSession | None = None,
         proxy: str | None = None,
         verify: bool | None = True,
+        pool: ConnectionPool | None = None,
+        batch_window: int | float | None = None,
+        max_batch_size: int = 100,
+        codec: JSONCodec | None = None,
     ):
         self.url = url
         self.username = username
@@ -55,6 +75,10 @@ class RPCProxy:
         self.xpub = xpub
         self.proxy = proxy
         self.verify = verify
+        self.pool = pool
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.codec = codec or get_default_codec()
         self._connector_class: type[aiohttp.BaseConnector] = aiohttp.TCPConnector
         self._connector_init: dict[str, Any] = {"ssl": self.verify}
         self._spec = {"exceptions": {"-32600": {"exc_name": "UnauthorizedError", "docstring": "Unauthorized"}}}
@@ -62,6 +86,9 @@ class RPCProxy:
         self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
         if session is not None:
             self._sessions[get_event_loop()] = session
+        self._pending: dict[asyncio.AbstractEventLoop, list[tuple[dict, asyncio.Future]]] = {}
+        self._flush_handles: dict[asyncio.AbstractEventLoop, asyncio.TimerHandle] = {}
+        self._batch_tasks: set[asyncio.Task] = set()
         self._finalizer = weakref.finalize(self, _cleanup_sessions, self._sessions)
 
     @property
@@ -70,6 +97,9 @@ class RPCProxy:
         session = self._sessions.get(loop)
         if session is not None:
             return session
+        if self.pool is not None:
+            key = (self.url, self.username, self.password, self.proxy, self.verify)
+            return self.pool.get_session(self.url, key, self.create_session)
         self._sessions[loop] = self.create_session()
         return self._sessions[loop]
 
@@ -91,8 +121,11 @@ class RPCProxy:
 
     def create_session(self) -> aiohttp.ClientSession:
         self.init_proxy()
+        connector_init = self._connector_init
+        if self.pool is not None:
+            connector_init = {**connector_init, **self.pool.connector_options()}
         return aiohttp.ClientSession(
-            connector=self._connector_class(**self._connector_init),
+            connector=self._connector_class(**connector_init),
             auth=aiohttp.BasicAuth(self.username, self.password),  # type: ignore
         )
 
@@ -123,30 +156,130 @@ class RPCProxy:
                 self._spec = spec
         return self._spec
 
+    async def _post(self, payload: Any) -> Any:
+        try:
+            async with self.session.post(
+                self.url,
+                data=self.codec.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=5 * 60),
+            ) as response:
+                return parse(self.codec.loads(await response.read()))
+        except aiohttp.ClientConnectionError as e:
+            raise ConnectionFailedError() from e
+
+    async def _get_result(self, parsed: Ok | Error) -> Any:
+        if isinstance(parsed, Ok):
+            return parsed.result
+        message = parsed.message
+        error_code = str(parsed.code)
+        exceptions = (await self.spec)["exceptions"]
+        if error_code in exceptions:
+            exc = exceptions[error_code]
+            raise generate_exception(exc["exc_name"])(exc["docstring"])
+        raise UnknownError(f"Unknown error from server: {message}")
+
+    async def _send_batch(self, calls: list[tuple[dict, asyncio.Future]]) -> None:
+        if not calls:
+            return
+        try:
+            parsed = await self._post(calls[0][0] if len(calls) == 1 else [payload for payload, _ in calls])
+        except Exception as e:
+            for _, future in calls:
+                if not future.done():
+                    _set_exception(future, e)
+            return
+        if isinstance(parsed, Ok | Error):
+            parsed = [parsed]
+        responses = {response.id: response for response in parsed}
+        for payload, future in calls:
+            if future.done():
+                continue
+            # the whole batch may be rejected with a single error object without id
+            response = responses.get(payload["id"], responses.get(None))
+            try:
+                if response is None:
+                    raise UnknownError("No response from server for batched request")
+                future.set_result(await self._get_result(response))
+            except Exception as e:
+                _set_exception(future, e)
+
+    def _flush_pending(self, loop: asyncio.AbstractEventLoop) -> None:
+        handle = self._flush_handles.pop(loop, None)
+        if handle is not None:
+            handle.cancel()
+        calls = self._pending.pop(loop, [])
+        if calls:
+            task = loop.create_task(self._send_batch(calls))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _coalesce(self, payload: dict, window: int | float) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(loop, [])
+        pending.append((payload, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush_pending(loop)
+        elif len(pending) == 1:
+            self._flush_handles[loop] = loop.call_later(window, self._flush_pending, loop)
+        return await future
+
+    def batch(self) -> "RPCBatch":
+        """Send multiple calls in a single JSON-RPC batch request
+
+        Calls made inside the context manager return futures, which are resolved
+        when the batch is sent on exit. Errors are raised per-call when awaiting the futures.
+        Calls are split into requests of at most ``max_batch_size`` calls each.
+
+        Examples:
+            >>> async with btc.server.batch() as batch:
+            ...     req1 = batch.get_request(address1)
+            ...     req2 = batch.get_request(address2)
+            >>> await req1
+            {'amount_BTC': '0.5', 'address': '...', ...}
+
+        Returns:
+            RPCBatch: batch context manager
+        """
+        return RPCBatch(self)
+
     def __getattr__(self, method: str, *args: Any, **kwargs: Any) -> Callable:
         @async_to_sync_wraps
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            try:
-                async with self.session.post(
-                    self.url,
-                    data=json_encode(create_request(method, *args, xpub=self.xpub, **kwargs)),
-                    timeout=aiohttp.ClientTimeout(total=5 * 60),
-                ) as response:
-                    parsed = parse_json(await response.text())
-                    if isinstance(parsed, Ok):
-                        return parsed.result
-                    message = parsed.message
-                    error_code = str(parsed.code)
-                    exceptions = (await self.spec)["exceptions"]
-                    if error_code in exceptions:
-                        exc = exceptions[error_code]
-                        raise generate_exception(exc["exc_name"])(exc["docstring"])
-                    raise UnknownError(f"Unknown error from server: {message}")
-            except aiohttp.ClientConnectionError as e:
-                raise ConnectionFailedError() from e
+            payload = create_request(method, *args, xpub=self.xpub, **kwargs)
+            if self.batch_window is not None:
+                return await self._coalesce(payload, self.batch_window)
+            return await self._get_result(await self._post(payload))
 
         return wrapper
 
     async def close(self) -> None:
         if self._finalizer.alive:
             self._finalizer()
+
+
+class RPCBatch:
+    def __init__(self, proxy: RPCProxy):
+        self.proxy = proxy
+        self.calls: list[tuple[dict, asyncio.Future]] = []
+
+    def __getattr__(self, method: str) -> Callable[..., asyncio.Future]:
+        def wrapper(*args: Any, **kwargs: Any) -> asyncio.Future:
+            future = get_event_loop().create_future()
+            self.calls.append((create_request(method, *args, xpub=self.proxy.xpub, **kwargs), future))
+            return future
+
+        return wrapper
+
+    async def __aenter__(self) -> "RPCBatch":
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, *args: Any) -> None:
+        if exc_type is not None:
+            for _, future in self.calls:
+                future.cancel()
+            return
+        size = self.proxy.max_batch_size
+        chunks = [self.calls[i : i + size] for i in range(0, len(self.calls), size)]
+        await asyncio.gather(*(self.proxy._send_batch(chunk) for chunk in chunks))
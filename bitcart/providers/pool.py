@@ -0,0 +1,92 @@
+import asyncio
+import weakref
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import aiohttp
+from universalasync import get_event_loop
+
+
+def _cleanup_sessions(sessions: dict[Any, aiohttp.ClientSession]) -> None:
+    loop = get_event_loop()
+    for session in list(sessions.values()):
+        if session is None or session.closed:
+            continue
+        if loop.is_running():
+            loop.create_task(session.close())
+        else:
+            loop.run_until_complete(session.close())
+    sessions.clear()
+
+
+class ConnectionPool:
+    """Pool of client sessions shared between RPCProxy instances
+
+    Every RPCProxy connected to the same daemon (same url, credentials and proxy) in the same event loop
+    reuses one session and one connector from the pool, instead of opening its own sockets.
+
+    Examples:
+        >>> pool = ConnectionPool(limit_per_host=20)
+        >>> btc = BTC(xpub="xpub1", pool=pool)
+        >>> btc2 = BTC(xpub="xpub2", pool=pool)  # shares connections with btc
+
+    Args:
+        limit (int, optional): total number of simultaneous connections per session. Defaults to 100.
+        limit_per_host (int, optional): number of simultaneous connections to a single host, 0 means no limit.
+            Defaults to 0.
+        keepalive_timeout (Union[int, float], optional): seconds to keep idle connections open. Defaults to 15.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, keepalive_timeout: int | float = 15):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions: dict[Hashable, aiohttp.ClientSession] = {}
+        self._urls: dict[Hashable, str] = {}
+        self._finalizer = weakref.finalize(self, _cleanup_sessions, self._sessions)
+
+    def connector_options(self) -> dict[str, Any]:
+        return {"limit": self.limit, "limit_per_host": self.limit_per_host, "keepalive_timeout": self.keepalive_timeout}
+
+    def get_session(self, url: str, key: Hashable, factory: Callable[[], aiohttp.ClientSession]) -> aiohttp.ClientSession:
+        key = (key, get_event_loop())
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = self._sessions[key] = factory()
+            self._urls[key] = url
+        return session
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get pool occupancy
+
+        Examples:
+            >>> pool.stats()
+            [{'url': 'http://localhost:5000', 'in_use': 2, 'idle': 8, 'limit': 100, 'limit_per_host': 0}]
+
+        Returns:
+            list[dict[str, Any]]: one entry per pooled session
+        """
+        result = []
+        for key, session in self._sessions.items():
+            if session.closed:
+                continue
+            connector = session.connector
+            # aiohttp has no public api for connector occupancy, these private attributes are checked in tests
+            # against the pinned aiohttp version and fall back to zeros if they are missing
+            result.append(
+                {
+                    "url": self._urls[key],
+                    "in_use": len(getattr(connector, "_acquired", ())),
+                    "idle": sum(len(conns) for conns in getattr(connector, "_conns", {}).values()),
+                    "limit": getattr(connector, "limit", self.limit),
+                    "limit_per_host": getattr(connector, "limit_per_host", self.limit_per_host),
+                }
+            )
+        return result
+
+    async def close(self) -> None:
+        """Close all pooled sessions"""
+        sessions = [session for session in self._sessions.values() if not session.closed]
+        self._sessions.clear()
+        self._urls.clear()
+        await asyncio.gather(*(session.close() for session in sessions))
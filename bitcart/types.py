@@ -1,4 +1,5 @@
 from collections import UserDict, defaultdict
+from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any
 
@@ -16,3 +17,20 @@ class ExtendedDict(ExtendedDictMixin, UserDict):
 
 class ExtendedDefaultDict(ExtendedDictMixin, defaultdict):
     pass
+
+
+@dataclass(frozen=True)
+class Event:
+    """Event received from daemon
+
+    Attributes:
+        event (str): event name, i.e. ``new_transaction``
+        data (dict): additional event data, i.e. ``{"tx": "..."}``
+        currency (str): currency of the wallet
+        wallet (Optional[str]): wallet the event belongs to
+    """
+
+    event: str
+    data: dict = field(default_factory=dict)
+    currency: str = "BTC"
+    wallet: str | None = None
@@ -67,6 +67,18 @@ def json_encode(obj: Any) -> Any:
     return json.dumps(obj, cls=CustomJSONEncoder)
 
 
+def get_handler_params(func: Callable) -> frozenset[str]:
+    """Get names of parameters accepted by an event handler
+
+    Args:
+        func (Callable): event handler
+
+    Returns:
+        frozenset[str]: parameter names
+    """
+    return frozenset(inspect.signature(func).parameters.keys())
+
+
 async def call_universal(func: Callable, *args: Any, **kwargs: Any) -> Any:
     """Call a function: async or sync one. All passed arguments are passed to the function too
 
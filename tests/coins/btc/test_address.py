@@ -0,0 +1,68 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from bitcart import BTC
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def mocked_btc(mocker):
+    btc = BTC()
+    state = {"running": 0, "peak": 0, "started": [], "cancelled": [], "fail": "13", "hang_from": 20}
+
+    async def get_transaction(tx_hash):
+        state["started"].append(tx_hash)
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(0.001 * (int(tx_hash) % 3))  # finish out of order
+            if int(tx_hash) >= state["hang_from"]:
+                await asyncio.Event().wait()
+            if tx_hash == state["fail"]:
+                raise ValueError("boom")
+            return {"txid": tx_hash}
+        except asyncio.CancelledError:
+            state["cancelled"].append(tx_hash)
+            raise
+        finally:
+            state["running"] -= 1
+
+    history = [{"tx_hash": str(i), "height": i} for i in range(20)]
+    mocker.patch.object(btc.server, "getaddresshistory", mocker.AsyncMock(return_value=history), create=True)
+    mocker.patch.object(btc.server, "get_transaction", get_transaction, create=True)
+    return btc, state
+
+
+async def test_get_address_order_and_concurrency(mocked_btc):
+    btc, state = mocked_btc
+    state["fail"] = None
+    txes = await btc.get_address("address", concurrency=4)
+    assert [item["tx_hash"] for item in txes] == [str(i) for i in range(20)]
+    assert all(item["tx"] == {"txid": item["tx_hash"]} for item in txes)
+    assert state["peak"] == 4
+
+
+async def test_get_address_order(mocked_btc):
+    btc, state = mocked_btc
+    state["hang_from"] = 10  # so that fetched ahead transactions are still running when iteration stops
+    async with aclosing(btc.iter_address("address", concurrency=4)) as txes:
+        result = []
+        async for item in txes:
+            result.append(item)
+            if len(result) == 10:
+                break
+    assert [item["tx"]["txid"] for item in result] == [str(i) for i in range(10)]
+    assert state["peak"] <= 4
+    assert state["cancelled"]  # fetched ahead transactions are cancelled on close
+    assert state["running"] == 0
+
+
+async def test_get_address_error_cancels(mocked_btc):
+    btc, state = mocked_btc
+    with pytest.raises(ValueError, match="boom"):
+        await btc.get_address("address", concurrency=4)
+    assert len(state["started"]) < 20
+    assert state["running"] == 0
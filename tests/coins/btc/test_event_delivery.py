@@ -1,7 +1,9 @@
 import queue
 
 import pytest
+from aiohttp import ClientConnectionError
 
+from bitcart.backoff import Backoff
 from bitcart.errors import ConnectionFailedError
 from tests.utils import patch_session
 
@@ -53,3 +55,127 @@ async def test_event_delivery_less_params(patched_session, btc_wallet, mocker):
     await btc_wallet.start_websocket(auto_reconnect=False)
     assert test_queue.qsize() == 1
     assert test_queue.get() is True
+
+
+class StopLoop(Exception):
+    pass
+
+
+async def test_reconnect_backoff(btc_wallet, mocker):
+    sleeps = mocker.patch("bitcart.event_delivery.asyncio.sleep")
+    attempts = []
+    outcomes = iter(["connect", "fail", "fail", "fail", "connect", "stop"])
+
+    async def connect(reconnect_callback):
+        outcome = next(outcomes)
+        if outcome == "fail":
+            raise ClientConnectionError()
+        if outcome == "stop":
+            raise StopLoop()
+        await reconnect_callback()
+
+    with pytest.raises(StopLoop):
+        await btc_wallet._websocket_base_loop(
+            connect,
+            force_connect=True,
+            backoff=Backoff(initial=0, multiplier=2, jitter=False),
+            reconnect_attempt_callback=lambda attempt, delay: attempts.append(attempt),
+        )
+    assert attempts == [1, 2, 3, 4, 1]
+    assert [call.args[0] for call in sleeps.call_args_list] == [0, 0, 0, 0, 0]
+    stats = btc_wallet.connection_stats()
+    assert (stats["connects"], stats["disconnects"], stats["reconnect_attempts"]) == (2, 2, 5)
+    assert stats["downtime"] == stats["last_downtime"] >= 0
+
+
+async def test_reconnect_backoff_quick_drops(btc_wallet, mocker):
+    sleeps = mocker.patch("bitcart.event_delivery.asyncio.sleep")
+    outcomes = iter(["fail", "fail", "connect", "connect", "stop"])
+
+    async def connect(reconnect_callback):
+        outcome = next(outcomes)
+        if outcome == "fail":
+            raise ClientConnectionError()
+        if outcome == "stop":
+            raise StopLoop()
+        await reconnect_callback()
+
+    with pytest.raises(StopLoop):
+        await btc_wallet._websocket_base_loop(connect, force_connect=True, backoff=Backoff(initial=1, jitter=False))
+    # first retry is immediate, connections dropped right away don't reset the backoff
+    assert [call.args[0] for call in sleeps.call_args_list] == [0, 1, 2, 4]
+
+
+async def test_backoff_delays(mocker):
+    backoff = Backoff(initial=1, maximum=10, multiplier=3, jitter=False)
+    assert [backoff.delay(attempt) for attempt in range(1, 5)] == [1, 3, 9, 10]
+    uniform = mocker.patch("bitcart.backoff.random.uniform", return_value=0.5)
+    assert Backoff(initial=2).delay(2) == 0.5
+    uniform.assert_called_once_with(0, 4)
+
+
+async def test_recover_missed_updates(btc_wallet, mocker):
+    history = {
+        "transactions": [
+            {"txid": "old", "height": 90},
+            {"txid": "delivered", "height": 0},
+            {"txid": "confirmed_in_gap", "height": 101},
+            {"txid": "mempool", "height": 0},
+        ]
+    }
+    mocker.patch.object(btc_wallet.server, "getinfo", mocker.AsyncMock(return_value={"blockchain_height": 102}), create=True)
+    mocker.patch.object(btc_wallet.server, "onchain_history", mocker.AsyncMock(return_value=history), create=True)
+    received = []
+    btc_wallet.add_event_handler("new_transaction", lambda event, tx: received.append(tx))
+    btc_wallet.add_event_handler("new_block", lambda event, height: received.append(height))
+    assert await btc_wallet._get_missed_updates(100) == []  # first connection only sets the cursor
+    await btc_wallet.process_updates([{"event": "new_transaction", "tx": "delivered"}])
+    outcomes = iter(["connect", "connect", "stop"])
+
+    async def connect(reconnect_callback):
+        if next(outcomes) == "stop":
+            raise StopLoop()
+        await reconnect_callback()
+
+    mocker.patch("bitcart.event_delivery.asyncio.sleep")
+    with pytest.raises(StopLoop):
+        await btc_wallet._websocket_base_loop(connect, recover_missed=True)
+    await btc_wallet.dispatcher.join()
+    assert received == ["delivered", "confirmed_in_gap", "mempool", 102]
+    await btc_wallet.close()
+
+
+async def test_recover_missed_updates_error(btc_wallet, mocker, caplog):
+    mocker.patch.object(btc_wallet.server, "getinfo", mocker.AsyncMock(side_effect=ValueError("boom")), create=True)
+    called = []
+
+    async def connect(reconnect_callback):
+        await reconnect_callback()
+
+    await btc_wallet._websocket_base_loop(
+        connect, auto_reconnect=False, recover_missed=True, reconnect_callback=lambda: called.append(True)
+    )
+    assert called == [True]
+    assert "Error occured during missed updates recovery" in caplog.text
+
+
+async def test_adaptive_polling(btc_wallet, mocker):
+    responses = [[{"event": "new_block", "height": 1}], [{"event": "new_block", "height": 2}], [], [], [], ValueError()]
+    mocker.patch.object(btc_wallet.server, "get_updates", mocker.AsyncMock(side_effect=responses), create=True)
+    sleeps = mocker.patch("bitcart.event_delivery.asyncio.sleep", side_effect=[None] * 5 + [StopLoop()])
+    received = []
+    btc_wallet.add_event_handler("new_block", lambda event, height: received.append(height))
+    with pytest.raises(StopLoop):
+        await btc_wallet.poll_updates(interval=2, min_interval=0.5, max_interval=4, backoff=Backoff(initial=3, jitter=False))
+    assert received == [1, 2]
+    assert [call.args[0] for call in sleeps.call_args_list] == [1, 0.5, 1, 2, 4, 3]
+
+
+async def test_long_polling(btc_wallet, mocker):
+    get_updates = mocker.AsyncMock(side_effect=[[], [{"event": "new_block", "height": 1}], StopLoop()])
+    mocker.patch.object(btc_wallet.server, "get_updates", get_updates, create=True)
+    sleeps = mocker.patch("bitcart.event_delivery.asyncio.sleep")
+    with pytest.raises(StopLoop):
+        await btc_wallet.poll_updates(long_poll_timeout=30)
+    assert get_updates.await_args_list == [mocker.call(timeout=30)] * 3
+    sleeps.assert_not_called()
@@ -1,7 +1,14 @@
+import asyncio
+import inspect
+import threading
+from contextlib import aclosing
 from queue import Queue
 
 import pytest
 
+from bitcart import BTC
+from bitcart.types import Event
+
 test_queue = Queue()
 
 
@@ -25,8 +32,8 @@ async def test_event_system(btc, caplog):
     assert btc.add_event_handler(["new_transaction", "event2"], handler) is None
     assert btc.add_event_handler("new_block", async_handler) is None
     assert set(btc.event_handlers.keys()) == {"event", "event1", "event2", "new_transaction", "new_block"}
-    assert btc.event_handlers["new_transaction"] == handler
-    assert btc.event_handlers["new_block"] == async_handler
+    assert btc.event_handlers["new_transaction"] == [handler]
+    assert btc.event_handlers["new_block"] == [async_handler]
     assert await btc.process_updates({}) is None  # ignoring exceptions
     assert await btc.process_updates([[]]) is None  # ignoring exceptions
     await btc.process_updates([{}])
@@ -40,3 +47,119 @@ async def test_event_system(btc, caplog):
     assert test_queue.qsize() == 2
     assert test_queue.get() == 2
     assert test_queue.get() == 3
+
+
+async def test_handler_signature_cached(btc, mocker):
+    received = []
+
+    def kwargs_handler(event, height=None, tx=None):
+        received.append((height, tx))
+
+    signature = mocker.spy(inspect, "signature")
+    btc.add_event_handler(["new_block", "new_transaction"], kwargs_handler)
+    assert signature.call_count == 1
+    await btc.process_updates([{"event": "new_block", "height": 1}, {"event": "new_transaction", "tx": "test"}])
+    assert signature.call_count == 1
+    assert received == [(1, None), (None, "test")]
+    btc.event_handlers["new_block"] = async_handler  # direct modification is picked up
+    await btc.process_updates([{"event": "new_block", "height": 2, "extra": True}])
+    assert signature.call_count == 2
+    assert test_queue.get() == 3
+
+
+@pytest.mark.asyncio
+async def test_events_iterator(btc_wallet, xpub):
+    received = []
+
+    async def consume():
+        async with aclosing(btc_wallet.events("new_transaction")) as events:
+            async for event in events:
+                received.append(event)
+                if len(received) == 2:
+                    break
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)  # let the iterator subscribe
+    await btc_wallet.process_updates(
+        [
+            {"event": "new_block", "height": 1},
+            {"event": "new_transaction", "tx": "a"},
+            {"event": "new_transaction", "tx": "b"},
+        ]
+    )
+    await task
+    assert received == [Event("new_transaction", {"tx": "a"}, "BTC", xpub), Event("new_transaction", {"tx": "b"}, "BTC", xpub)]
+    assert btc_wallet._subscriptions == []
+
+
+@pytest.mark.asyncio
+async def test_event_batches(btc_wallet):
+    batches = btc_wallet.event_batches(max_size=2, max_wait=0.05)
+    first = asyncio.ensure_future(anext(batches))
+    await asyncio.sleep(0)
+    await btc_wallet.process_updates([{"event": "new_block", "height": height} for height in range(3)])
+    assert [event.data["height"] for event in await first] == [0, 1]
+    assert [event.data["height"] for event in await anext(batches)] == [2]  # returned after max_wait
+    await batches.aclose()
+    assert btc_wallet._subscriptions == []
+
+
+async def hang(event):
+    await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_multiple_handlers(btc):
+    received = []
+    first = lambda event, tx: received.append(("first", tx))  # noqa: E731
+    btc.add_event_handler("new_transaction", first)
+    btc.add_event_handler("new_transaction", lambda event: received.append(("second", None)))
+    btc.add_event_handler("new_transaction", first)  # already added
+    await btc.process_updates([{"event": "new_transaction", "tx": "a"}])
+    assert received == [("first", "a"), ("second", None)]
+    btc.remove_event_handler("new_transaction", first)
+    assert first not in btc._handler_info
+    await btc.process_updates([{"event": "new_transaction", "tx": "b"}])
+    assert received[2:] == [("second", None)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("handler_mode", ["concurrent", "thread"])
+async def test_handler_modes_and_timeouts(xpub, handler_mode, caplog):
+    btc = BTC(xpub=xpub, handler_mode=handler_mode)
+    received = []
+    event = asyncio.Event()
+
+    async def slow(event_name, tx):
+        await event.wait()
+        received.append("slow")
+
+    async def fast(event_name, tx):
+        received.append("fast")
+        event.set()
+
+    def blocking(event_name, tx):
+        received.append(threading.current_thread() is threading.main_thread())
+
+    btc.add_event_handler("new_transaction", slow, timeout=1)
+    btc.add_event_handler("new_transaction", fast)
+    btc.add_event_handler("new_transaction", blocking)
+    btc.add_event_handler("new_transaction", hang, timeout=0.01)
+    await btc.process_updates([{"event": "new_transaction", "tx": "a"}])
+    assert received == ["fast", handler_mode == "concurrent", "slow"]  # slow handler doesn't block the others
+    assert "timed out after 0.01 seconds" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_sequential_handler_timeout(btc, caplog):
+    received = []
+    btc.add_event_handler("new_block", hang, timeout=0.01)
+    btc.add_event_handler("new_block", lambda event, height: received.append(height))
+    await btc.process_updates([{"event": "new_block", "height": 1}])
+    assert received == [1]
+    assert "timed out" in caplog.text
+
+
+def test_invalid_handler_mode():
+    with pytest.raises(ValueError):
+        BTC(handler_mode="unknown")
@@ -0,0 +1,49 @@
+from bitcart import BTC
+from bitcart.cache import LRUCache
+
+
+async def test_lru_cache_eviction():
+    cache = LRUCache(max_size=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1  # "b" is now least recently used
+    await cache.set("c", 3)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+    await cache.delete("c")
+    assert await cache.get("c") is None
+    assert cache.stats()["size"] == 1
+
+
+async def test_lru_cache_byte_bound():
+    cache = LRUCache(max_bytes=15)
+    await cache.set("a", "x" * 8)
+    await cache.set("b", "y" * 8)
+    assert await cache.get("a") is None
+    assert await cache.get("b") == "y" * 8
+    assert cache.size_bytes == 10
+    await cache.set("c", "z" * 30)  # bigger than the whole cache
+    assert await cache.get("c") is None
+    await cache.set("b", "y")
+    assert cache.size_bytes == 3
+
+
+async def test_get_tx_cache(mocker):
+    cache = LRUCache()
+    btc = BTC(tx_cache=cache)
+    txes = {"confirmed": {"txid": "confirmed", "confirmations": 3}, "unconfirmed": {"txid": "unconfirmed", "confirmations": 0}}
+    get_transaction = mocker.AsyncMock(side_effect=lambda tx: dict(txes[tx]))
+    getinfo = mocker.AsyncMock(return_value={"blockchain_height": 100})
+    mocker.patch.object(btc.server, "get_transaction", get_transaction, create=True)
+    mocker.patch.object(btc.server, "getinfo", getinfo, create=True)
+    for _ in range(3):
+        assert await btc.get_tx("confirmed") == txes["confirmed"]
+        assert await btc.get_tx("unconfirmed") == txes["unconfirmed"]
+    assert get_transaction.await_count == 4
+    assert cache.stats() == {"hits": 2, "misses": 4, "size": 1, "size_bytes": 0}
+    assert await cache.get(("BTC", "confirmed")) == {"tx": {"txid": "confirmed"}, "block_height": 98}
+    # confirmations of cached transactions grow with new blocks
+    await btc.process_updates([{"event": "new_block", "height": 105}])
+    assert await btc.get_tx("confirmed") == {"txid": "confirmed", "confirmations": 8}
+    assert getinfo.await_count == 4  # no more calls once height is known from events
@@ -0,0 +1,45 @@
+from bitcart import BTC
+from bitcart.dedup import Deduplicator
+
+
+async def test_deduplicator_window(mocker):
+    now = mocker.patch("bitcart.dedup.time.monotonic", return_value=0)
+    deduplicator = Deduplicator(window=10)
+    assert not deduplicator.is_duplicate("a")
+    assert deduplicator.is_duplicate("a")
+    now.return_value = 15  # rotated, still remembered in previous generation
+    assert deduplicator.is_duplicate("a")
+    assert not deduplicator.is_duplicate("b")
+    now.return_value = 26
+    assert not deduplicator.is_duplicate("a")
+    now.return_value = 50  # both generations expired
+    assert not deduplicator.is_duplicate("b")
+    assert deduplicator.stats() == {"unique": 4, "duplicates": 2, "size": 1}
+
+
+async def test_deduplicator_max_size():
+    deduplicator = Deduplicator(max_size=2)
+    for key in range(5):
+        assert not deduplicator.is_duplicate(key)
+    assert deduplicator.stats()["size"] <= 4
+    assert not deduplicator.is_duplicate(0)  # forgotten because of size limit
+
+
+async def test_process_updates_deduplication(xpub):
+    coin = BTC(xpub=xpub, deduplicator=Deduplicator())
+    received = []
+    coin.add_event_handler("new_transaction", lambda event, tx: received.append(tx))
+    coin.add_event_handler("new_payment", lambda event, address, status: received.append((address, status)))
+    updates = [
+        {"event": "new_transaction", "tx": "a"},
+        {"event": "new_payment", "address": "addr", "status": 0},
+        {"event": "new_payment", "address": "addr", "status": 1},
+    ]
+    await coin.process_updates(updates)
+    await coin.process_updates(updates + [{"event": "new_transaction", "tx": "b"}])
+    assert received == ["a", ("addr", 0), ("addr", 1), "b"]
+    assert coin.deduplicator.stats()["duplicates"] == 3
+    # other wallets' events are not duplicates
+    other = BTC(xpub="other", deduplicator=coin.deduplicator)
+    await other.process_updates([{"event": "new_transaction", "tx": "a"}])
+    assert coin.deduplicator.stats()["duplicates"] == 3
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from bitcart.dispatch import EventDispatcher
+
+
+async def test_dispatcher_ordering():
+    dispatcher = EventDispatcher(workers=4)
+    results = {"a": [], "b": []}
+
+    async def process(key, i):
+        await asyncio.sleep(0.001 * (5 - i))  # earlier updates take longer
+        results[key].append(i)
+
+    for i in range(5):
+        for key in results:
+            await dispatcher.submit(key, process, key, i)
+    await dispatcher.join()
+    assert results == {"a": [0, 1, 2, 3, 4], "b": [0, 1, 2, 3, 4]}
+    assert dispatcher.stats()["processed"] == 10
+    await dispatcher.close()
+
+
+async def test_dispatcher_drop_oldest():
+    dispatcher = EventDispatcher(workers=1, maxsize=2, overflow="drop_oldest")
+    event = asyncio.Event()
+    results = []
+
+    async def process(i):
+        await event.wait()
+        results.append(i)
+
+    for i in range(5):
+        await dispatcher.submit(None, process, i)
+        await asyncio.sleep(0)  # let the worker pick up the first update
+    assert dispatcher.stats()["depth"] == 2
+    event.set()
+    await dispatcher.join()
+    assert results == [0, 3, 4]
+    stats = dispatcher.stats()
+    assert (stats["dropped"], stats["max_depth"]) == (2, 2)
+    await dispatcher.close()
+
+
+async def test_dispatcher_block_and_errors(caplog):
+    dispatcher = EventDispatcher(workers=1, maxsize=1)
+    event = asyncio.Event()
+
+    async def process():
+        await event.wait()
+        raise ValueError("boom")
+
+    for _ in range(2):
+        await dispatcher.submit(None, process)
+        await asyncio.sleep(0)
+    submit = asyncio.ensure_future(dispatcher.submit(None, process))
+    await asyncio.sleep(0.01)
+    assert not submit.done()  # blocked until there is free space
+    event.set()
+    await submit
+    await dispatcher.join()
+    assert caplog.text.count("ValueError: boom") == 3
+    await dispatcher.close()
+
+
+def test_dispatcher_invalid_policy():
+    with pytest.raises(ValueError):
+        EventDispatcher(overflow="unknown")
+
+
+async def test_dispatcher_close_waits_for_queued():
+    dispatcher = EventDispatcher(workers=2)
+    results = []
+
+    async def process(i):
+        await asyncio.sleep(0.001)
+        results.append(i)
+
+    for i in range(4):
+        await dispatcher.submit(i, process, i)
+    await dispatcher.close()
+    assert sorted(results) == [0, 1, 2, 3]
+    assert dispatcher.stats()["depth"] == 0
+
+
+async def test_dispatcher_constructor_option_and_close():
+    from bitcart import BTC, APIManager
+
+    dispatcher = EventDispatcher(workers=2)
+    coin = BTC(dispatcher=dispatcher)
+    manager = APIManager(dispatcher=dispatcher)
+    assert coin.dispatcher is dispatcher
+    assert manager.dispatcher is dispatcher
+    await dispatcher.submit(None, asyncio.sleep, 0)
+    assert dispatcher._tasks
+    await coin.close()
+    assert not dispatcher._tasks
+    await manager.close()
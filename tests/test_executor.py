@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from bitcart import BTC
+from bitcart.executor import HandlerExecutor
+
+received = []
+
+
+def record_thread(event, tx):
+    received.append((tx, threading.current_thread() is threading.main_thread()))
+
+
+def square(value):
+    return value * value
+
+
+async def test_sync_handlers_offloaded(xpub):
+    executor = HandlerExecutor(max_workers=2)
+    coin = BTC(xpub=xpub, handler_executor=executor)
+    coin.add_event_handler("new_transaction", record_thread)
+    await coin.process_updates([{"event": "new_transaction", "tx": "a"}])
+    assert received == [("a", False)]
+    stats = executor.stats()
+    assert (stats["submitted"], stats["completed"], stats["failed"], stats["pending"]) == (1, 1, 0, 0)
+    assert stats["queue_time_max"] >= stats["queue_time_avg"] >= 0
+    await coin.close()
+    assert executor._executor is None
+
+
+async def test_executor_errors():
+    executor = HandlerExecutor()
+    with pytest.raises(ZeroDivisionError):
+        await executor.run(lambda: 1 / 0)
+    assert executor.stats()["failed"] == 1
+    assert await executor.run(square, 3) == 9
+    await executor.close()
+    assert await executor.run(square, 2) == 4  # pool is recreated after close
+    await executor.close()
+
+
+async def test_process_executor():
+    executor = HandlerExecutor(kind="process", max_workers=1)
+    assert await executor.run(square, 4) == 16
+    await executor.close()
+
+
+def test_invalid_executor_kind():
+    with pytest.raises(ValueError):
+        HandlerExecutor(kind="unknown")
@@ -1,11 +1,17 @@
 import asyncio
+import json
+from decimal import Decimal
 
 import aiohttp
 import pytest
 from universalasync import get_event_loop
 
-from bitcart.errors import ConnectionFailedError, UnknownError
+from bitcart import BTC
+from bitcart.errors import ConnectionFailedError, UnknownError, errors
+from bitcart.providers.codecs import JSONCodec, MsgspecCodec, OrjsonCodec, get_default_codec
 from bitcart.providers.jsonrpcrequests import RPCProxy, _cleanup_sessions, create_request
+from bitcart.providers.pool import ConnectionPool
+from tests.conftest import FakeDaemon
 
 MOCK_RPC_URL = "http://localhost:5000"
 
@@ -73,7 +79,7 @@ def test_cleanup_skips_closed_or_none_sessions(mocker):
 
 def _mock_session_with_response(mocker, body: str):
     response = mocker.MagicMock()
-    response.text = mocker.AsyncMock(return_value=body)
+    response.read = mocker.AsyncMock(return_value=body.encode())
     session = mocker.MagicMock()
     session.post.return_value.__aenter__.return_value = response
     return session
@@ -96,3 +102,156 @@ async def test_wrapper_wraps_connection_errors(mocker):
     proxy._sessions[get_event_loop()] = session
     with pytest.raises(ConnectionFailedError):
         await proxy.some_method()
+
+
+async def test_pool_shares_sessions():
+    pool = ConnectionPool(limit_per_host=5)
+    try:
+        proxy1 = RPCProxy(MOCK_RPC_URL, "user", "pass", xpub="xpub1", pool=pool)
+        proxy2 = RPCProxy(MOCK_RPC_URL, "user", "pass", xpub="xpub2", pool=pool)
+        proxy3 = RPCProxy("http://localhost:5001", "user", "pass", pool=pool)
+        assert proxy1.session is proxy2.session
+        assert proxy1.session is not proxy3.session
+        assert proxy1.session.connector.limit_per_host == 5
+        stats = pool.stats()
+        assert [entry["url"] for entry in stats] == [MOCK_RPC_URL, "http://localhost:5001"]
+        assert stats[0] == {"url": MOCK_RPC_URL, "in_use": 0, "idle": 0, "limit": 100, "limit_per_host": 5}
+        await proxy1.close()  # pooled sessions are owned by the pool
+        assert not proxy2.session.closed
+    finally:
+        await pool.close()
+    assert pool.stats() == []
+
+
+def _mock_batch_session(mocker, reply):
+    session = mocker.MagicMock()
+
+    def post(url, data, **kwargs):
+        response = mocker.MagicMock()
+        response.read = mocker.AsyncMock(return_value=json.dumps(reply(json.loads(data))).encode())
+        context = mocker.MagicMock()
+        context.__aenter__ = mocker.AsyncMock(return_value=response)
+        context.__aexit__ = mocker.AsyncMock(return_value=None)
+        return context
+
+    session.post.side_effect = post
+    return session
+
+
+async def test_batch(mocker):
+    proxy = RPCProxy(MOCK_RPC_URL, xpub="xpub")
+    proxy._spec = {"exceptions": {"-32600": {"exc_name": "UnauthorizedError", "docstring": "Unauthorized"}}}
+    proxy._spec_valid = True
+
+    def reply(requests):
+        assert [request["params"] for request in requests] == [{"xpub": "xpub"}, ["addr", {"xpub": "xpub"}], {"xpub": "xpub"}]
+        return [
+            {"jsonrpc": "2.0", "error": {"code": -32600, "message": "unauthorized"}, "id": requests[1]["id"]},
+            {"jsonrpc": "2.0", "result": {"confirmed": "1"}, "id": requests[0]["id"]},
+        ]
+
+    proxy._sessions[get_event_loop()] = _mock_batch_session(mocker, reply)
+    async with proxy.batch() as batch:
+        balance = batch.getbalance()
+        request = batch.get_request("addr")
+        missing = batch.help()
+    assert proxy._sessions[get_event_loop()].post.call_count == 1
+    assert await balance == {"confirmed": "1"}
+    with pytest.raises(errors.UnauthorizedError):
+        await request
+    with pytest.raises(UnknownError):
+        await missing
+
+
+async def test_batch_whole_error_and_connection_failure(mocker):
+    proxy = RPCProxy(MOCK_RPC_URL)
+    proxy._spec_valid = True
+    proxy._sessions[get_event_loop()] = _mock_batch_session(
+        mocker, lambda requests: {"jsonrpc": "2.0", "error": {"code": -99999, "message": "boom"}, "id": None}
+    )
+    async with proxy.batch() as batch:
+        futures = [batch.help(), batch.help()]
+    for future in futures:
+        with pytest.raises(UnknownError, match="boom"):
+            await future
+    session = mocker.MagicMock()
+    session.post.side_effect = aiohttp.ClientConnectionError("no route")
+    proxy._sessions[get_event_loop()] = session
+    async with proxy.batch() as batch:
+        future = batch.help()
+    with pytest.raises(ConnectionFailedError):
+        await future
+    async with proxy.batch():
+        pass  # empty batches are not sent
+    assert session.post.call_count == 1
+
+
+async def test_coalescing(mocker):
+    proxy = RPCProxy(MOCK_RPC_URL, batch_window=0.01, max_batch_size=3)
+
+    def reply(requests):
+        if isinstance(requests, dict):
+            return {"jsonrpc": "2.0", "result": requests["params"][0], "id": requests["id"]}
+        return [{"jsonrpc": "2.0", "result": request["params"][0], "id": request["id"]} for request in reversed(requests)]
+
+    session = _mock_batch_session(mocker, reply)
+    proxy._sessions[get_event_loop()] = session
+    assert await asyncio.gather(*(proxy.echo(i) for i in range(5))) == [0, 1, 2, 3, 4]
+    assert session.post.call_count == 2  # one full batch of 3 and one flushed by timer
+    assert await proxy.echo(5) == 5  # single calls are sent without batch wrapping
+    assert isinstance(json.loads(session.post.call_args.kwargs["data"]), dict)
+    assert not proxy._pending
+    assert not proxy._flush_handles
+
+
+def test_coin_passes_rpc_options():
+    btc = BTC(batch_window=0.002, max_batch_size=10)
+    assert btc.server.batch_window == 0.002
+    assert btc.server.max_batch_size == 10
+
+
+@pytest.mark.parametrize("codec_class,module", [(JSONCodec, "json"), (MsgspecCodec, "msgspec"), (OrjsonCodec, "orjson")])
+def test_codecs(codec_class, module):
+    pytest.importorskip(module)
+    codec = codec_class()
+    assert json.loads(codec.dumps({"amount": Decimal("0.1"), "params": [1, "a"]})) == {"amount": "0.1", "params": [1, "a"]}
+    assert codec.loads(b'{"result": [1, "a"]}') == {"result": [1, "a"]}
+    with pytest.raises(TypeError):
+        codec.dumps(object())
+
+
+def test_default_codec(mocker):
+    assert isinstance(RPCProxy(MOCK_RPC_URL).codec, JSONCodec)
+    mocker.patch.dict("sys.modules", {"msgspec": None})
+    assert type(get_default_codec()) is JSONCodec
+
+
+async def test_pool_stats_occupancy():
+    daemon = FakeDaemon()
+    port = (await daemon.start())["localhost"]
+    pool = ConnectionPool()
+    try:
+        proxy = RPCProxy(f"http://127.0.0.1:{port}", "user", "pass", pool=pool)
+        async with proxy.session.ws_connect(f"http://127.0.0.1:{port}/ws") as ws:
+            assert pool.stats()[0]["in_use"] == 1
+            await ws.receive()
+    finally:
+        await pool.close()
+        await daemon.stop()
+
+
+async def test_batch_chunks(mocker):
+    proxy = RPCProxy(MOCK_RPC_URL, max_batch_size=2)
+    sizes = []
+
+    def reply(requests):
+        if isinstance(requests, dict):  # single calls are sent without batch wrapping
+            requests = [requests]
+        sizes.append(len(requests))
+        return [{"jsonrpc": "2.0", "result": request["params"][0], "id": request["id"]} for request in requests]
+
+    proxy._sessions[get_event_loop()] = _mock_batch_session(mocker, reply)
+    async with proxy.batch() as batch:
+        futures = [batch.echo(i) for i in range(5)]
+    assert sorted(sizes) == [1, 2, 2]
+    assert [await future for future in futures] == [0, 1, 2, 3, 4]
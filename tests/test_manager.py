@@ -1,3 +1,4 @@
+import asyncio
 import queue
 
 import pytest
@@ -5,6 +6,8 @@ import pytest
 from bitcart import BCH, BTC, LTC
 from bitcart.errors import CurrencyUnsupportedError, NoCurrenciesRegisteredError
 from bitcart.manager import APIManager
+from bitcart.types import Event
+from tests.conftest import TEST_XPUB, FakeDaemon, patched_session_maker
 from tests.utils import patch_session
 
 pytestmark = pytest.mark.asyncio
@@ -100,3 +103,95 @@ async def test_manager_bad_currency(patched_session_bad_currency, websocket_mana
     await websocket_manager.start_websocket(auto_reconnect=False)
     assert test_queue.qsize() == 0
     assert "Received event for unsupported currency: test" in caplog.text
+
+
+async def test_manager_shares_pool(xpub):
+    manager = APIManager({"BTC": [xpub, "test"], "LTC": [xpub]})
+    assert manager.BTC[xpub].server.pool is manager.pool
+    assert manager.BTC[xpub].server.session is manager.BTC["test"].server.session
+    assert manager.BTC[xpub].server.session is not manager.LTC[xpub].server.session
+    assert len(manager.pool.stats()) == 2
+    await manager.close()
+    assert manager.pool.stats() == []
+
+
+async def test_manager_handlers_not_merged(manager, xpub):
+    wallet = manager.BTC[xpub]
+    wallet.add_event_handler("new_block", lambda instance, event, height: test_queue2.put(("wallet", height)))
+    wallet.add_event_handler("new_transaction", lambda instance, event, tx: test_queue2.put(("wallet", tx)))
+    manager.add_event_handler("new_transaction", lambda instance, event, tx: test_queue2.put(("manager", tx)))
+    await manager.process_updates(
+        [{"event": "new_block", "height": 1}, {"event": "new_transaction", "tx": "test"}], currency="BTC", wallet=xpub
+    )
+    assert [test_queue2.get_nowait(), test_queue2.get_nowait()] == [("wallet", 1), ("manager", "test")]
+    assert set(wallet.event_handlers) == {"new_block", "new_transaction"}
+    assert wallet.event_handlers["new_transaction"] is not manager.event_handlers["new_transaction"]
+
+
+class FakeMultiCurrencyDaemon(FakeDaemon):
+    connections = 0
+
+    async def reply_to_websocket(self, ws):
+        FakeMultiCurrencyDaemon.connections += 1
+        for currency in ("BTC", "LTC"):
+            await ws.send_json(
+                {"currency": currency, "wallet": TEST_XPUB, "updates": [{"event": "new_transaction", "tx": currency}]}
+            )
+
+
+async def test_manager_websocket_per_endpoint(xpub, mocker):
+    session, daemon = await patched_session_maker(FakeMultiCurrencyDaemon)
+    patch_session(mocker, session)
+    manager = APIManager(
+        {"BTC": [xpub], "LTC": [xpub], "BCH": [xpub]}, custom_params={"LTC": {"rpc_url": "http://localhost:5000"}}
+    )
+    assert list(manager._get_websocket_endpoints().values()) == [["BTC", "LTC"], ["BCH"]]
+    received = []
+    manager.add_event_handler("new_transaction", lambda instance, event, tx: received.append((instance.coin_name, tx)))
+    await manager.start_websocket(auto_reconnect=False, reconnect_callback=reconnect_callback)
+    # BTC and LTC share one connection, BCH daemon is a different endpoint
+    assert FakeMultiCurrencyDaemon.connections == 2
+    assert sorted(test_queue2.get_nowait() for _ in range(test_queue2.qsize())) == ["BCH", "BTC", "LTC"]
+    assert sorted(received) == [("BTC", "BTC"), ("BTC", "BTC"), ("LTC", "LTC"), ("LTC", "LTC")]
+    await session.close()
+    await daemon.stop()
+
+
+async def test_manager_recover_missed_updates(manager, xpub, mocker):
+    wallet = manager.BTC[xpub]
+    getinfo = mocker.AsyncMock(side_effect=[{"blockchain_height": 11}, {"blockchain_height": 12}, {"blockchain_height": 12}])
+    mocker.patch.object(wallet.server, "getinfo", getinfo, create=True)
+    history = {"transactions": [{"txid": "old", "height": 10}, {"txid": "missed", "height": 12}]}
+    mocker.patch.object(wallet.server, "onchain_history", mocker.AsyncMock(return_value=history), create=True)
+    received = []
+    manager.add_event_handler("new_transaction", lambda instance, event, tx: received.append(tx))
+    await manager._recover_missed_updates("BTC")  # cursor is set on first connection
+    await manager._recover_missed_updates("BTC")
+    await manager._recover_missed_updates("BTC")
+    await manager.close()
+    assert received == ["missed"]
+
+
+async def test_manager_events(manager, xpub):
+    events = manager.events(wallets=xpub)
+    received = asyncio.ensure_future(anext(events))
+    await asyncio.sleep(0)
+    await manager.process_updates([{"event": "new_transaction", "tx": "other"}], currency="BTC", wallet="other")
+    await manager.process_updates([{"event": "new_transaction", "tx": "test"}], currency="BTC", wallet=xpub)
+    assert await received == Event("new_transaction", {"tx": "test"}, "BTC", xpub)
+    await events.aclose()
+
+
+async def test_manager_poll_updates(xpub, mocker):
+    manager = APIManager({"BTC": [xpub], "LTC": [xpub]})
+    received = []
+    manager.add_event_handler("new_block", lambda instance, event, height: received.append((instance.coin_name, height)))
+    for currency, height in (("BTC", 1), ("LTC", 2)):
+        updates = mocker.AsyncMock(side_effect=[[{"event": "new_block", "height": height}], asyncio.CancelledError()])
+        mocker.patch.object(manager.wallets[currency][xpub].server, "get_updates", updates, create=True)
+    mocker.patch("bitcart.event_delivery.asyncio.sleep")
+    with pytest.raises(asyncio.CancelledError):
+        await manager.poll_updates()
+    assert sorted(received) == [("BTC", 1), ("LTC", 2)]
+    with pytest.raises(NoCurrenciesRegisteredError):
+        await APIManager().poll_updates()